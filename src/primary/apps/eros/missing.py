@@ -13,9 +13,9 @@ from typing import List, Dict, Any, Set, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.eros import api as eros_api
 from src.primary.settings_manager import load_settings, get_advanced_setting
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import get_processed_ids, add_processed_id
 from src.primary.stats_manager import increment_stat
-from src.primary.utils.history_utils import log_processed_media
+from src.primary.utils.history_utils import log_processed_media_batch
 from src.primary.state import check_state_reset
 
 # Get logger for the app
@@ -120,13 +120,14 @@ def process_missing_items(
         return False
         
     # Filter out already processed items using stateful management
+    processed_ids = get_processed_ids("eros", instance_name)
     unprocessed_items = []
     for item in missing_items:
         item_id = str(item.get("id"))
-        if not is_processed("eros", instance_name, item_id):
+        if item_id not in processed_ids:
             unprocessed_items.append(item)
         else:
-            eros_logger.debug(f"Skipping already processed item ID: {item_id}")
+            eros_logger.debug("Skipping already processed item ID: %s", item_id)
     
     eros_logger.info(f"Found {len(unprocessed_items)} unprocessed items out of {len(missing_items)} total items with missing files.")
     
@@ -136,6 +137,7 @@ def process_missing_items(
         
     items_processed = 0
     processing_done = False
+    processed_media = []
     
     # Select items to search based on configuration
     eros_logger.info(f"Randomly selecting up to {hunt_missing_items} missing items.")
@@ -191,9 +193,8 @@ def process_missing_items(
         if search_command_id:
             eros_logger.info(f"Triggered search command {search_command_id}. Assuming success for now.")
             
-            # Log to history system
-            log_processed_media("eros", item_info, item_id, instance_name, "missing")
-            eros_logger.debug(f"Logged history entry for item: {item_info}")
+            # Collect for the history log, written once after the loop
+            processed_media.append((item_info, item_id))
             
             items_processed += 1
             processing_done = True
@@ -210,6 +211,11 @@ def process_missing_items(
             # Do not mark as processed if search couldn't be triggered
             continue
     
+    # Log all searched items to history with a single write
+    if processed_media:
+        log_processed_media_batch("eros", processed_media, instance_name, "missing")
+        eros_logger.debug(f"Logged {len(processed_media)} history entries for {instance_name}")
+    
     # Log final status
     if items_processed > 0:
         eros_logger.info(f"Completed processing {items_processed} missing items for this cycle.")
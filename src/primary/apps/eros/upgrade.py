@@ -13,9 +13,9 @@ from typing import List, Dict, Any, Set, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.eros import api as eros_api
 from src.primary.settings_manager import load_settings, get_advanced_setting
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import get_processed_ids, add_processed_id
 from src.primary.stats_manager import increment_stat
-from src.primary.utils.history_utils import log_processed_media
+from src.primary.utils.history_utils import log_processed_media_batch
 from src.primary.state import check_state_reset
 
 # Get logger for the app
@@ -93,13 +93,14 @@ def process_cutoff_upgrades(
     eros_logger.info(f"Found {len(upgrade_eligible_data)} items eligible for quality upgrade.")
     
     # Filter out already processed items using stateful management
+    processed_ids = get_processed_ids("eros", instance_name)
     unprocessed_items = []
     for item in upgrade_eligible_data:
         item_id = str(item.get("id"))
-        if not is_processed("eros", instance_name, item_id):
+        if item_id not in processed_ids:
             unprocessed_items.append(item)
         else:
-            eros_logger.debug(f"Skipping already processed item ID: {item_id}")
+            eros_logger.debug("Skipping already processed item ID: %s", item_id)
     
     eros_logger.info(f"Found {len(unprocessed_items)} unprocessed items out of {len(upgrade_eligible_data)} total items eligible for quality upgrade.")
     
@@ -109,6 +110,7 @@ def process_cutoff_upgrades(
     
     items_processed = 0
     processing_done = False
+    processed_media = []
     
     # Always use random selection for upgrades
     eros_logger.info(f"Randomly selecting up to {hunt_upgrade_items} items for quality upgrade.")
@@ -156,8 +158,6 @@ def process_cutoff_upgrades(
         add_processed_id("eros", instance_name, str(item_id))
         eros_logger.debug(f"Added item ID {item_id} to processed list for {instance_name}")
         
-        # Refresh the item information if not skipped
-        refresh_command_id = None
         # Refresh functionality has been removed as it was identified as a performance bottleneck
         
         # Check for stop signal before searching
@@ -171,9 +171,8 @@ def process_cutoff_upgrades(
         if search_command_id:
             eros_logger.info(f"Triggered search command {search_command_id}. Assuming success for now.")
             
-            # Log to history so the upgrade appears in the history UI
-            log_processed_media("eros", item_info, item_id, instance_name, "upgrade")
-            eros_logger.debug(f"Logged quality upgrade to history for item ID {item_id}")
+            # Collect for the history log so the upgrade appears in the history UI
+            processed_media.append((item_info, item_id))
             
             items_processed += 1
             processing_done = True
@@ -190,6 +189,11 @@ def process_cutoff_upgrades(
             # Do not mark as processed if search couldn't be triggered
             continue
     
+    # Log all searched items to history with a single write
+    if processed_media:
+        log_processed_media_batch("eros", processed_media, instance_name, "upgrade")
+        eros_logger.debug(f"Logged {len(processed_media)} history entries for {instance_name}")
+    
     # Log final status
     if items_processed > 0:
         eros_logger.info(f"Completed processing {items_processed} items for quality upgrade for this cycle.")
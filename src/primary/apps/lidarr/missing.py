@@ -13,7 +13,7 @@ from typing import Dict, Any, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.lidarr import api as lidarr_api
 from src.primary.stats_manager import increment_stat
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import get_processed_ids, add_processed_id
 from src.primary.utils.history_utils import log_processed_media
 from src.primary.settings_manager import load_settings, get_advanced_setting
 from src.primary.state import get_state_file_path, check_state_reset
@@ -153,8 +153,9 @@ def process_missing_albums(
             
             # Filter out already processed artists
             lidarr_logger.info(f"Found {len(target_entities)} artists with missing albums before filtering")
+            processed_ids = get_processed_ids("lidarr", instance_name)
             unprocessed_entities = [eid for eid in target_entities 
-                                   if not is_processed("lidarr", instance_name, str(eid))]
+                                   if str(eid) not in processed_ids]
             
             lidarr_logger.info(f"Found {len(unprocessed_entities)} unprocessed artists out of {len(target_entities)} total")
         else:
@@ -163,8 +164,9 @@ def process_missing_albums(
             
             # Filter out processed albums
             lidarr_logger.info(f"Found {len(target_entities)} missing albums before filtering")
+            processed_ids = get_processed_ids("lidarr", instance_name)
             unprocessed_entities = [eid for eid in target_entities 
-                                   if not is_processed("lidarr", instance_name, str(eid))]
+                                   if str(eid) not in processed_ids]
             
             lidarr_logger.info(f"Found {len(unprocessed_entities)} unprocessed albums out of {len(target_entities)} total")
         
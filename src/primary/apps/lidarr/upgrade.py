@@ -10,7 +10,7 @@ from typing import Dict, Any, Optional, Callable, List, Union, Set # Added List,
 from src.primary.utils.logger import get_logger
 from src.primary.apps.lidarr import api as lidarr_api
 from src.primary.utils.history_utils import log_processed_media
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import get_processed_ids, add_processed_id
 from src.primary.stats_manager import increment_stat
 from src.primary.settings_manager import load_settings, get_advanced_setting
 from src.primary.state import check_state_reset  # Add the missing import
@@ -95,13 +95,14 @@ def process_cutoff_upgrades(
         lidarr_logger.info(f"Found {len(cutoff_unmet_albums)} cutoff unmet albums for {instance_name}.")
 
         # Filter out already processed items
+        processed_ids = get_processed_ids("lidarr", instance_name)
         unprocessed_albums = []
         for album in cutoff_unmet_albums:
             album_id = str(album.get('id'))
-            if not is_processed("lidarr", instance_name, album_id):
+            if album_id not in processed_ids:
                 unprocessed_albums.append(album)
             else:
-                lidarr_logger.debug(f"Skipping already processed album ID: {album_id}")
+                lidarr_logger.debug("Skipping already processed album ID: %s", album_id)
         
         lidarr_logger.info(f"Found {len(unprocessed_albums)} unprocessed albums out of {len(cutoff_unmet_albums)} total albums eligible for quality upgrade.")
         
@@ -156,17 +157,14 @@ def process_cutoff_upgrades(
             lidarr_logger.debug(f"Upgrade album search command triggered with ID: {command_id} for albums: {album_ids_to_search}")
             increment_stat("lidarr", "upgraded") # Use appropriate stat key
             
-            # Log to history
-            for album_id in album_ids_to_search:
-                # Find the album info for this ID to log to history
-                for album in albums_to_search:
-                    if album['id'] == album_id:
-                        album_title = album.get('title', f'Album ID {album_id}')
-                        artist_name = album.get('artist', {}).get('artistName', 'Unknown Artist')
-                        media_name = f"{artist_name} - {album_title}"
-                        log_processed_media("lidarr", media_name, album_id, instance_name, "upgrade")
-                        lidarr_logger.debug(f"Logged quality upgrade to history for album ID {album_id}")
-                        break
+            # Log to history, the search IDs were taken from these albums in the same order
+            for album in albums_to_search:
+                album_id = album['id']
+                album_title = album.get('title', f'Album ID {album_id}')
+                artist_name = album.get('artist', {}).get('artistName', 'Unknown Artist')
+                media_name = f"{artist_name} - {album_title}"
+                log_processed_media("lidarr", media_name, album_id, instance_name, "upgrade")
+                lidarr_logger.debug(f"Logged quality upgrade to history for album ID {album_id}")
                 
             time.sleep(command_wait_delay) # Basic delay
             processed_count += len(album_ids_to_search)
@@ -9,16 +9,19 @@ import json
 import sys
 import time
 import traceback
+import random
 from typing import List, Dict, Any, Optional, Union
 # Correct the import path
 from src.primary.utils.logger import get_logger
+from src.primary.utils.http_utils import create_arr_session
 from src.primary.settings_manager import get_ssl_verify_setting
+from src.primary.stats_manager import check_hourly_cap_exceeded, increment_hourly_cap
 
 # Get logger for the Radarr app
 radarr_logger = get_logger("radarr")
 
 # Use a session for better performance
-session = requests.Session()
+session = create_arr_session()
 
 def arr_request(api_url: str, api_key: str, api_timeout: int, endpoint: str, method: str = "GET",  data: Optional[Dict] = None, params: Optional[Dict] = None, count_api: bool = True) -> Any:
     """
@@ -43,7 +46,6 @@ def arr_request(api_url: str, api_key: str, api_timeout: int, endpoint: str, met
             return None
         
         # Check API limit before making request
-        from src.primary.stats_manager import check_hourly_cap_exceeded, increment_hourly_cap
         if check_hourly_cap_exceeded("radarr"):
             radarr_logger.warning("\U0001F6D1 Radarr API hourly limit reached - skipping request")
             return None
@@ -239,8 +241,6 @@ def get_cutoff_unmet_movies_random_page(api_url: str, api_key: str, api_timeout:
     Returns:
         List of movie dictionaries representing cutoff unmet movies, or None if error
     """
-    import random
-    
     radarr_logger.debug(f"Fetching random sample of cutoff unmet movies (monitored_only={monitored_only}, count={count})...")
     
     # First, get the first page to determine total pages/records
@@ -11,8 +11,8 @@ from typing import List, Dict, Any, Set, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.radarr import api as radarr_api
 from src.primary.stats_manager import increment_stat_only
-from src.primary.stateful_manager import is_processed, add_processed_id
-from src.primary.utils.history_utils import log_processed_media
+from src.primary.stateful_manager import get_processed_ids, add_processed_id
+from src.primary.utils.history_utils import log_processed_media_batch
 from src.primary.settings_manager import load_settings, get_advanced_setting
 
 # Get logger for the app
@@ -126,13 +126,14 @@ def process_missing_movies(
     processing_done = False
     
     # Filter out already processed movies using stateful management
+    processed_ids = get_processed_ids("radarr", instance_name)
     unprocessed_movies = []
     for movie in missing_movies:
         movie_id = str(movie.get("id"))
-        if not is_processed("radarr", instance_name, movie_id):
+        if movie_id not in processed_ids:
             unprocessed_movies.append(movie)
         else:
-            radarr_logger.debug(f"Skipping already processed movie ID: {movie_id}")
+            radarr_logger.debug("Skipping already processed movie ID: %s", movie_id)
     
     radarr_logger.info(f"Found {len(unprocessed_movies)} unprocessed missing movies out of {len(missing_movies)} total.")
     
@@ -158,6 +159,8 @@ def process_missing_movies(
             year = movie.get("year", "Unknown Year")
             radarr_logger.info(f"  {idx+1}. {movie_title} ({year}) - ID: {movie_id}")
     
+    processed_media = []
+    
     # Process each movie
     for movie in movies_to_process:
         if stop_check():
@@ -179,11 +182,9 @@ def process_missing_movies(
             success = add_processed_id("radarr", instance_name, str(movie_id))
             radarr_logger.debug(f"Added processed ID: {movie_id}, success: {success}")
             
-            # Log to history system
+            # Collect for the history log, written once after the loop
             year = movie.get("year", "Unknown Year")
-            media_name = f"{movie_title} ({year})"
-            log_processed_media("radarr", media_name, movie_id, instance_name, "missing")
-            radarr_logger.debug(f"Logged history entry for movie: {media_name}")
+            processed_media.append((f"{movie_title} ({year})", movie_id))
             
             increment_stat_only("radarr", "hunted")
             movies_processed += 1
@@ -191,5 +192,10 @@ def process_missing_movies(
         else:
             radarr_logger.warning(f"Failed to trigger search for movie '{movie_title}'")
     
+    # Log all searched movies to history with a single write
+    if processed_media:
+        log_processed_media_batch("radarr", processed_media, instance_name, "missing")
+        radarr_logger.debug(f"Logged {len(processed_media)} history entries for {instance_name}")
+    
     radarr_logger.info(f"Finished processing missing movies. Processed {movies_processed} of {len(movies_to_process)} selected movies.")
     return processed_any
\ No newline at end of file
@@ -10,8 +10,8 @@ from typing import List, Dict, Any, Set, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.radarr import api as radarr_api
 from src.primary.stats_manager import increment_stat, increment_stat_only
-from src.primary.stateful_manager import is_processed, add_processed_id
-from src.primary.utils.history_utils import log_processed_media
+from src.primary.stateful_manager import get_processed_ids, add_processed_id
+from src.primary.utils.history_utils import log_processed_media_batch
 from src.primary.settings_manager import get_advanced_setting
 
 # Get logger for the app
@@ -62,13 +62,14 @@ def process_cutoff_upgrades(
     radarr_logger.info(f"Found {len(upgrade_eligible_data)} movies eligible for upgrade.")
 
     # Filter out already processed movies using stateful management
+    processed_ids = get_processed_ids("radarr", instance_name)
     unprocessed_movies = []
     for movie in upgrade_eligible_data:
         movie_id = str(movie.get("id"))
-        if not is_processed("radarr", instance_name, movie_id):
+        if movie_id not in processed_ids:
             unprocessed_movies.append(movie)
         else:
-            radarr_logger.debug(f"Skipping already processed movie ID: {movie_id}")
+            radarr_logger.debug("Skipping already processed movie ID: %s", movie_id)
     
     radarr_logger.info(f"Found {len(unprocessed_movies)} unprocessed movies for upgrade out of {len(upgrade_eligible_data)} total.")
     
@@ -82,6 +83,7 @@ def process_cutoff_upgrades(
     radarr_logger.info(f"Selected {len(movies_to_process)} movies to search for upgrades.")
     processed_count = 0
     processed_something = False
+    processed_media = []
     
     for movie in movies_to_process:
         if stop_check():
@@ -105,15 +107,18 @@ def process_cutoff_upgrades(
             add_processed_id("radarr", instance_name, str(movie_id))
             increment_stat_only("radarr", "upgraded")
             
-            # Log to history so the upgrade appears in the history UI
-            media_name = f"{movie_title} ({movie_year})"
-            log_processed_media("radarr", media_name, movie_id, instance_name, "upgrade")
-            radarr_logger.debug(f"Logged quality upgrade to history for movie ID {movie_id}")
+            # Collect for the history log, written once after the loop
+            processed_media.append((f"{movie_title} ({movie_year})", movie_id))
             
             processed_count += 1
             processed_something = True
         else:
             radarr_logger.warning(f"  - Failed to trigger search for quality upgrade.")
+    
+    # Log all upgrade searches to history with a single write
+    if processed_media:
+        log_processed_media_batch("radarr", processed_media, instance_name, "upgrade")
+        radarr_logger.debug(f"Logged {len(processed_media)} quality upgrades to history for {instance_name}")
             
     # Log final status
     radarr_logger.info(f"Completed processing {processed_count} movies for quality upgrades.")
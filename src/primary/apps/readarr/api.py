@@ -11,6 +11,7 @@ import datetime
 from typing import List, Dict, Any, Optional, Union
 # Correct the import path
 from src.primary.utils.logger import get_logger
+from src.primary.utils.http_utils import create_arr_session
 # Import load_settings
 from src.primary.settings_manager import load_settings, get_ssl_verify_setting
 import importlib
@@ -19,7 +20,7 @@ import importlib
 logger = get_logger("readarr")
 
 # Use a session for better performance
-session = requests.Session()
+session = create_arr_session()
 
 # Default API timeout in seconds - used as fallback only
 API_TIMEOUT = 30
@@ -48,7 +49,7 @@ def check_connection(api_url: str, api_key: str, api_timeout: int) -> bool:
         }
         logger.debug(f"Using User-Agent: {headers['User-Agent']}")
         
-        response = requests.get(full_url, headers=headers, timeout=api_timeout, verify=get_ssl_verify_setting())
+        response = session.get(full_url, headers=headers, timeout=api_timeout, verify=get_ssl_verify_setting())
         response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
         logger.debug("Successfully connected to Readarr.")
         return True
@@ -157,7 +158,6 @@ def arr_request(endpoint: str, method: str = "GET", data: Dict = None, app_type:
     else:
         # No valid parameters, try loading from settings
         try:
-            from src.primary.settings_manager import load_settings
             settings = load_settings(app_type)
             url = settings.get('api_url', '')
             key = settings.get('api_key', '')
@@ -201,13 +201,13 @@ def arr_request(endpoint: str, method: str = "GET", data: Dict = None, app_type:
     # Make the request with appropriate method
     try:
         if method.upper() == "GET":
-            response = requests.get(full_url, headers=headers, params=params, timeout=timeout, verify=verify_ssl)
+            response = session.get(full_url, headers=headers, params=params, timeout=timeout, verify=verify_ssl)
         elif method.upper() == "POST":
-            response = requests.post(full_url, headers=headers, json=data, timeout=timeout, verify=verify_ssl)
+            response = session.post(full_url, headers=headers, json=data, timeout=timeout, verify=verify_ssl)
         elif method.upper() == "PUT":
-            response = requests.put(full_url, headers=headers, json=data, timeout=timeout, verify=verify_ssl)
+            response = session.put(full_url, headers=headers, json=data, timeout=timeout, verify=verify_ssl)
         elif method.upper() == "DELETE":
-            response = requests.delete(full_url, headers=headers, timeout=timeout, verify=verify_ssl)
+            response = session.delete(full_url, headers=headers, timeout=timeout, verify=verify_ssl)
         else:
             logger.error(f"Unsupported HTTP method: {method}")
             return None
@@ -258,8 +258,9 @@ def get_cutoff_unmet_books(api_url: Optional[str] = None, api_key: Optional[str]
     Returns:
         A list of book objects that need quality upgrades
     """
-    # The cutoffUnmet endpoint in Readarr
-    params = "cutoffUnmet=true"
+    # The cutoffUnmet endpoint in Readarr, with each book's author embedded so the
+    # history entries don't need a separate author request per book
+    params = "cutoffUnmet=true&includeAuthor=true"
     # Pass credentials to arr_request
     books = arr_request(f"wanted/cutoff?{params}", api_url=api_url, api_key=api_key, api_timeout=api_timeout)
     if not books or "records" not in books:
@@ -303,13 +304,15 @@ def get_wanted_missing_books(api_url: str, api_key: str, api_timeout: int, monit
         params = {
             'page': page,
             'pageSize': page_size,
+            # Embed each book's author so callers don't need a request per author
+            'includeAuthor': True,
             # Removed sorting parameters due to potential API issues
             # 'sortKey': 'author.sortName',
             # 'sortDirection': 'ascending',
             # 'monitored': monitored_only # Note: Check if Readarr API supports this directly for wanted/missing
         }
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=api_timeout, verify=get_ssl_verify_setting())
+            response = session.get(url, headers=headers, params=params, timeout=api_timeout, verify=get_ssl_verify_setting())
             response.raise_for_status()
             data = response.json()
 
@@ -386,7 +389,7 @@ def get_author_details(api_url: str, api_key: str, author_id: int, api_timeout:
     endpoint = f"{api_url}/api/v1/author/{author_id}"
     headers = {'X-Api-Key': api_key}
     try:
-        response = requests.get(endpoint, headers=headers, timeout=api_timeout, verify=get_ssl_verify_setting())
+        response = session.get(endpoint, headers=headers, timeout=api_timeout, verify=get_ssl_verify_setting())
         response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
         author_data = response.json()
         logger.debug(f"Successfully fetched details for author ID {author_id}.")
@@ -408,7 +411,7 @@ def search_books(api_url: str, api_key: str, book_ids: List[int], api_timeout: i
     }
     try:
         # This uses requests.post directly, not arr_request. It's already correct.
-        response = requests.post(endpoint, headers=headers, json=payload, timeout=api_timeout, verify=get_ssl_verify_setting())
+        response = session.post(endpoint, headers=headers, json=payload, timeout=api_timeout, verify=get_ssl_verify_setting())
         response.raise_for_status()
         command_data = response.json()
         command_id = command_data.get('id')
@@ -5,13 +5,14 @@ Handles searching for missing books in Readarr
 """
 
 import time
+import logging
 import random
 from typing import List, Dict, Any, Set, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.readarr import api as readarr_api
 from src.primary.stats_manager import increment_stat
-from src.primary.stateful_manager import is_processed, add_processed_id
-from src.primary.utils.history_utils import log_processed_media
+from src.primary.stateful_manager import get_processed_ids, add_processed_id
+from src.primary.utils.history_utils import log_processed_media_batch
 from src.primary.settings_manager import load_settings, get_advanced_setting
 from src.primary.state import check_state_reset
 
@@ -83,12 +84,13 @@ def process_missing_books(
     author_ids = list(books_by_author.keys())
 
     # Filter out already processed authors using stateful management
+    processed_ids = get_processed_ids("readarr", instance_name)
     unprocessed_authors = []
     for author_id in author_ids:
-        if not is_processed("readarr", instance_name, str(author_id)):
+        if str(author_id) not in processed_ids:
             unprocessed_authors.append(author_id)
         else:
-            readarr_logger.debug(f"Skipping already processed author ID: {author_id}")
+            readarr_logger.debug("Skipping already processed author ID: %s", author_id)
 
     readarr_logger.info(f"Found {len(unprocessed_authors)} unprocessed authors out of {len(author_ids)} total authors with missing books.")
     
@@ -99,67 +101,66 @@ def process_missing_books(
     # Always randomly select authors/books to process
     readarr_logger.info(f"Randomly selecting up to {hunt_missing_books} authors with missing books.")
     authors_to_process = random.sample(unprocessed_authors, min(hunt_missing_books, len(unprocessed_authors)))
+    # Work through the selection in ID order so Readarr reads neighbouring rows one after another
+    authors_to_process.sort()
 
     readarr_logger.info(f"Selected {len(authors_to_process)} authors to search for missing books.")
     processed_count = 0
     processed_something = False
     processed_authors = [] # Track author names processed
+    processed_media = [] # Books to log to history after the loop
 
     for author_id in authors_to_process:
         if stop_check():
             readarr_logger.info("Stop signal received, aborting Readarr missing cycle.")
             break
 
-        author_info = readarr_api.get_author_details(api_url, api_key, author_id, api_timeout) # Assuming this exists
+        # The missing books already embed their author, only fetch it when the API left it out
+        author_info = books_by_author[author_id][0].get("author") or readarr_api.get_author_details(api_url, api_key, author_id, api_timeout)
         author_name = author_info.get("authorName", f"Author ID {author_id}") if author_info else f"Author ID {author_id}"
 
-        readarr_logger.info(f"Processing missing books for author: \"{author_name}\" (Author ID: {author_id})")
+        readarr_logger.info('Processing missing books for author: "%s" (Author ID: %s)', author_name, author_id)
 
         # Refresh functionality has been removed as it was identified as a performance bottleneck
 
         # Search for missing books associated with the author
-        readarr_logger.info(f"  - Searching for missing books...")
+        readarr_logger.debug("  - Searching for missing books...")
         book_ids_for_author = [book['id'] for book in books_by_author[author_id]] # 'id' is bookId
         
-        # Create detailed log with book titles
-        book_details = []
-        for book in books_by_author[author_id]:
-            book_title = book.get('title', f"Book ID {book['id']}")
-            book_details.append(f"'{book_title}' (ID: {book['id']})")
-        
-        # Construct detailed log message
-        details_string = ', '.join(book_details)
-        log_message = f"Triggering Book Search for {len(book_details)} books by author '{author_name}': [{details_string}]"
-        readarr_logger.debug(log_message) # Changed level from INFO to DEBUG
-        
+        # Create detailed log with book titles, only when debug logging will write it
+        if readarr_logger.isEnabledFor(logging.DEBUG):
+            book_details = []
+            for book in books_by_author[author_id]:
+                book_title = book.get('title', f"Book ID {book['id']}")
+                book_details.append(f"'{book_title}' (ID: {book['id']})")
+
+            # Construct detailed log message
+            details_string = ', '.join(book_details)
+            readarr_logger.debug("Triggering Book Search for %d books by author '%s': [%s]", len(book_details), author_name, details_string)
+
         # Mark author as processed BEFORE triggering any searches
         add_processed_id("readarr", instance_name, str(author_id))
-        readarr_logger.debug(f"Added author ID {author_id} to processed list for {instance_name}")
-        
+        readarr_logger.debug("Added author ID %s to processed list for %s", author_id, instance_name)
+
         # Now trigger the search
         search_command_result = readarr_api.search_books(api_url, api_key, book_ids_for_author, api_timeout)
 
         if search_command_result:
             # Extract command ID if the result is a dictionary, otherwise use the result directly
             command_id = search_command_result.get('id') if isinstance(search_command_result, dict) else search_command_result
-            readarr_logger.info(f"Triggered book search command {command_id} for author {author_name}. Assuming success for now.") # Log only command ID
+            readarr_logger.info("Triggered book search command %s for author %s. Assuming success for now.", command_id, author_name) # Log only command ID
             increment_stat("readarr", "hunted")
             
-            # Log multiple history entries - one for each book with author info
+            # Collect one history entry for each book with author info, written once after the loop
             for book in books_by_author[author_id]:
                 book_title = book.get('title', f"Unknown Book ID {book['id']}")
                 # Format includes both author and book info
-                media_name = f"{author_name} - {book_title}"
-                # Log each book as a separate history entry with book_id
-                log_processed_media("readarr", media_name, book['id'], instance_name, "missing")
-                readarr_logger.debug(f"Logged missing book history entry: {media_name} (ID: {book['id']})")
-            
-            readarr_logger.debug(f"Logged history entries for {len(books_by_author[author_id])} books by author: {author_name}")
+                processed_media.append((f"{author_name} - {book_title}", book['id']))
             
             processed_count += 1 # Count processed authors/groups
             processed_authors.append(author_name) # Add to list of processed authors
             processed_something = True
-            readarr_logger.info(f"Processed {processed_count}/{len(authors_to_process)} authors/groups for missing books this cycle.")
+            readarr_logger.info("Processed %d/%d authors/groups for missing books this cycle.", processed_count, len(authors_to_process))
         else:
             readarr_logger.error(f"Failed to trigger search for author {author_name}.")
 
@@ -167,6 +168,11 @@ def process_missing_books(
             readarr_logger.info(f"Reached target of {hunt_missing_books} authors/groups processed for this cycle.")
             break
 
+    # Log all searched books to history with a single write
+    if processed_media:
+        log_processed_media_batch("readarr", processed_media, instance_name, "missing")
+        readarr_logger.debug(f"Logged {len(processed_media)} missing book history entries for {instance_name}")
+
     if processed_authors:
         authors_list = '", "'.join(processed_authors)
         readarr_logger.info(f'Completed processing {processed_count} authors/groups for missing books this cycle: "{authors_list}"')
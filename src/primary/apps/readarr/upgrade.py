@@ -11,8 +11,8 @@ from typing import List, Dict, Any, Set, Callable, Union, Optional
 from src.primary.utils.logger import get_logger
 from src.primary.apps.readarr import api as readarr_api
 from src.primary.stats_manager import increment_stat
-from src.primary.stateful_manager import is_processed, add_processed_id
-from src.primary.utils.history_utils import log_processed_media
+from src.primary.stateful_manager import get_processed_ids, add_processed_ids
+from src.primary.utils.history_utils import log_processed_media_batch
 from src.primary.state import check_state_reset
 from src.primary.settings_manager import load_settings # Import load_settings function
 
@@ -99,7 +99,7 @@ def process_cutoff_upgrades(
                     if release_date <= now:
                         filtered_books.append(book)
                     else:
-                        readarr_logger.debug(f"Skipping future book ID {book.get('id')} with release date {release_date_str}")
+                        readarr_logger.debug("Skipping future book ID %s with release date %s", book.get('id'), release_date_str)
                 except ValueError:
                     readarr_logger.warning(f"Could not parse release date '{release_date_str}' for book ID {book.get('id')}. Including anyway.")
                     filtered_books.append(book)
@@ -116,13 +116,14 @@ def process_cutoff_upgrades(
         return False
         
     # Filter out already processed books using stateful management
+    processed_ids = get_processed_ids("readarr", instance_name)
     unprocessed_books = []
     for book in upgrade_eligible_data:
         book_id = str(book.get("id"))
-        if not is_processed("readarr", instance_name, book_id):
+        if book_id not in processed_ids:
             unprocessed_books.append(book)
         else:
-            readarr_logger.debug(f"Skipping already processed book ID: {book_id}")
+            readarr_logger.debug("Skipping already processed book ID: %s", book_id)
     
     readarr_logger.info(f"Found {len(unprocessed_books)} unprocessed books out of {len(upgrade_eligible_data)} total books eligible for upgrade.")
     
@@ -138,12 +139,12 @@ def process_cutoff_upgrades(
     processed_count = 0
     processed_something = False
 
-    book_ids_to_search = [book.get("id") for book in books_to_process]
+    # Search the selection in ID order so Readarr reads neighbouring rows one after another
+    book_ids_to_search = sorted(book.get("id") for book in books_to_process)
 
-    # Mark books as processed BEFORE triggering any searches
-    for book_id in book_ids_to_search:
-        add_processed_id("readarr", instance_name, str(book_id))
-        readarr_logger.debug(f"Added book ID {book_id} to processed list for {instance_name}")
+    # Mark books as processed BEFORE triggering any searches, with one write
+    add_processed_ids("readarr", instance_name, [str(book_id) for book_id in book_ids_to_search])
+    readarr_logger.debug(f"Added {len(book_ids_to_search)} book IDs to processed list for {instance_name}")
         
     # Now trigger the search
     search_command_result = readarr_api.search_books(api_url, api_key, book_ids_to_search, api_timeout)
@@ -153,12 +154,16 @@ def process_cutoff_upgrades(
         readarr_logger.info(f"Triggered upgrade search command {command_id} for {len(book_ids_to_search)} books.")
         increment_stat("readarr", "upgraded")
             
-        # Log to history system for each book
+        # Log to history system for each book, with a single write for all of them
+        processed_media = []
+        author_names = {}  # Author ID -> name, so each missing author is only fetched once
         for book in books_to_process:
-            # Ensure we have a valid author name - if missing, fetch it
-            author_name = book.get("authorName")
+            # Ensure we have a valid author name - use the embedded author, and only fetch it if missing
+            author_name = book.get("authorName") or (book.get("author") or {}).get("authorName")
             author_id = book.get("authorId")
-            if not author_name and author_id:
+            if not author_name and author_id in author_names:
+                author_name = author_names[author_id]
+            elif not author_name and author_id:
                 try:
                     # Fetch author details to get the name
                     author_details = readarr_api.get_author_details(api_url, api_key, author_id, api_timeout)
@@ -169,16 +174,15 @@ def process_cutoff_upgrades(
                 except Exception as e:
                     readarr_logger.debug(f"Error fetching author details: {e}")
                     author_name = f"Author ID {author_id}"
+                author_names[author_id] = author_name
             elif not author_name:
                 author_name = "Unknown Author"
                 
             book_title = book.get("title", f"Book ID {book.get('id')}")
-            media_name = f"{author_name} - {book_title}"
-            
-            # Include full details in history entry
-            log_processed_media("readarr", media_name, book.get("id"), instance_name, "upgrade")
-            readarr_logger.debug(f"Logged quality upgrade to history for '{media_name}' (Book ID: {book.get('id')})")
-
+            processed_media.append((f"{author_name} - {book_title}", book.get("id")))
+        
+        log_processed_media_batch("readarr", processed_media, instance_name, "upgrade")
+        readarr_logger.debug(f"Logged {len(processed_media)} quality upgrades to history for {instance_name}")
             
         processed_count += len(book_ids_to_search)
         processed_something = True
@@ -11,16 +11,33 @@ import time
 import datetime
 import traceback
 import random
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Union, Callable
+
+# orjson is optional - it parses the large episode lists much faster than the stdlib
+orjson_import_error = None
+try:
+    import orjson
+except ImportError as e:
+    orjson_import_error = str(e)
+
 # Correct the import path
 from src.primary.utils.logger import get_logger
+from src.primary.utils.http_utils import create_arr_session
 from src.primary.settings_manager import get_ssl_verify_setting
 
 # Get logger for the Sonarr app
 sonarr_logger = get_logger("sonarr")
 
 # Use a session for better performance
-session = requests.Session()
+session = create_arr_session()
+
+# Upper bound on the per-series episode requests sent to one Sonarr instance at the same time
+MAX_SERIES_EPISODE_WORKERS = 8
+
+# Shared read-only fallback for missing nested objects, so filters over large
+# episode lists don't allocate a new dict per record
+_EMPTY: Dict = {}
 
 def arr_request(api_url: str, api_key: str, api_timeout: int, endpoint: str, method: str = "GET",  data: Optional[Dict] = None, params: Optional[Dict] = None) -> Any:
     """
@@ -85,7 +102,9 @@ def arr_request(api_url: str, api_key: str, api_timeout: int, endpoint: str, met
             # Check if there's any content before trying to parse JSON
             if response.content:
                 try:
-                    return response.json()
+                    if orjson_import_error:
+                        return response.json()
+                    return orjson.loads(response.content)
                 except json.JSONDecodeError as jde:
                     # Log detailed information about the malformed response
                     sonarr_logger.error(f"Error decoding JSON response from {endpoint}: {str(jde)}")
@@ -316,7 +335,7 @@ def get_missing_episodes(api_url: str, api_key: str, api_timeout: int, monitored
             break
         page += 1
     if monitored_only:
-        filtered_missing = [ep for ep in all_missing_episodes if ep.get('series', {}).get('monitored', False) and ep.get('monitored', False)]
+        filtered_missing = [ep for ep in all_missing_episodes if ep.get('monitored', False) and (ep.get('series') or _EMPTY).get('monitored', False)]
         return filtered_missing
     else:
         return all_missing_episodes
@@ -454,7 +473,7 @@ def get_cutoff_unmet_episodes(api_url: str, api_key: str, api_timeout: int, moni
         # Ensure series and episode are monitored
         filtered_cutoff_unmet = [
             ep for ep in all_cutoff_unmet
-            if ep.get('series', {}).get('monitored', False) and ep.get('monitored', False)
+            if ep.get('monitored', False) and (ep.get('series') or _EMPTY).get('monitored', False)
         ]
         sonarr_logger.debug(f"Filtered for monitored_only=True: {len(filtered_cutoff_unmet)} monitored cutoff unmet episodes remain (out of {original_count} total).")
         return filtered_cutoff_unmet
@@ -537,7 +556,7 @@ def get_cutoff_unmet_episodes_random_page(api_url: str, api_key: str, api_timeou
             if monitored_only:
                 filtered_records = [
                     ep for ep in records
-                    if ep.get('series', {}).get('monitored', False) and ep.get('monitored', False)
+                    if ep.get('monitored', False) and (ep.get('series') or _EMPTY).get('monitored', False)
                 ]
                 sonarr_logger.debug(f"Filtered to {len(filtered_records)} monitored missing episodes")
                 records = filtered_records
@@ -846,7 +865,7 @@ def get_cutoff_unmet_episodes_for_series(api_url: str, api_key: str, api_timeout
         original_count = len(verified_episodes)
         filtered_episodes = [
             ep for ep in verified_episodes 
-            if ep.get('series', {}).get('monitored', False) and ep.get('monitored', False)
+            if ep.get('monitored', False) and (ep.get('series') or _EMPTY).get('monitored', False)
         ]
         sonarr_logger.debug(f"Filtered for monitored_only=True: {len(filtered_episodes)} monitored episodes (out of {original_count} total)")
         return filtered_episodes
@@ -895,8 +914,20 @@ def get_series_with_missing_episodes(api_url: str, api_key: str, api_timeout: in
     # This is much more efficient than using the wanted/missing endpoint
     series_with_missing = []
     examined_count = 0
+    selected_series = filtered_series[:limit]
+    
+    # The episode lists are fetched in parallel since each request is network bound,
+    # arr_request returns None instead of raising when one fails
+    def fetch_series_episodes(series):
+        series_id = series.get('id')
+        if not series_id:
+            return None
+        return arr_request(api_url, api_key, api_timeout, f"episode?seriesId={series_id}")
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(len(selected_series), MAX_SERIES_EPISODE_WORKERS))) as executor:
+        series_episodes = list(executor.map(fetch_series_episodes, selected_series))
     
-    for series in filtered_series[:limit]:
+    for series, episodes in zip(selected_series, series_episodes):
         examined_count += 1
         series_id = series.get('id')
         series_title = series.get('title', 'Unknown')
@@ -904,10 +935,8 @@ def get_series_with_missing_episodes(api_url: str, api_key: str, api_timeout: in
         if not series_id:
             continue
             
-        # Get all episodes for this series
+        # Check the episodes of this series
         try:
-            endpoint = f"episode?seriesId={series_id}"
-            episodes = arr_request(api_url, api_key, api_timeout, endpoint)
             if not episodes:
                 continue
             # Filter to missing episodes
@@ -5,17 +5,22 @@ Sonarr missing episodes processing module for Huntarr
 
 import time
 import random
+from collections import namedtuple
+from operator import attrgetter
 from typing import List, Dict, Any, Set, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.sonarr import api as sonarr_api
-from src.primary.stats_manager import increment_stat
-from src.primary.stateful_manager import is_processed, add_processed_id
-from src.primary.utils.history_utils import log_processed_media
+from src.primary.stats_manager import increment_stat, increment_stat_only
+from src.primary.stateful_manager import get_processed_ids, add_processed_id, add_processed_ids
+from src.primary.utils.history_utils import log_processed_media, log_processed_media_batch
 from src.primary.settings_manager import load_settings, get_advanced_setting
 
 # Get logger for the Sonarr app
 sonarr_logger = get_logger("sonarr")
 
+# A season with missing episodes, a namedtuple since one is built for every such season on every cycle
+MissingSeason = namedtuple("MissingSeason", ["series_id", "season_number", "series_title", "episode_count"])
+
 def process_missing_episodes(
     api_url: str,
     api_key: str,
@@ -106,13 +111,14 @@ def process_missing_episodes_mode(
             sonarr_logger.info(f"Skipped {skipped_count} future episodes based on air date.")
     
     # Filter out already processed episodes for random selection approach
+    processed_ids = get_processed_ids("sonarr", instance_name)
     unprocessed_episodes = []
     for episode in episodes_to_search:
         episode_id = str(episode.get("id"))
-        if not is_processed("sonarr", instance_name, episode_id):
+        if episode_id not in processed_ids:
             unprocessed_episodes.append(episode)
         else:
-            sonarr_logger.debug(f"Skipping already processed episode ID: {episode_id}")
+            sonarr_logger.debug("Skipping already processed episode ID: %s", episode_id)
     
     sonarr_logger.info(f"Found {len(unprocessed_episodes)} unprocessed missing episodes out of {len(episodes_to_search)} total.")
     episodes_to_search = unprocessed_episodes
@@ -143,7 +149,9 @@ def process_missing_episodes_mode(
     # Group episodes by series for potential refresh
     series_to_refresh: Dict[int, List[int]] = {}
     series_titles: Dict[int, str] = {} # Store titles for logging
+    episodes_by_id: Dict[int, Dict[str, Any]] = {} # Episode data by ID for history logging
     for episode in episodes_to_search:
+        episodes_by_id[episode.get('id')] = episode
         series_id = episode.get('seriesId')
         if series_id:
             if series_id not in series_to_refresh:
@@ -160,18 +168,14 @@ def process_missing_episodes_mode(
 
         # Refresh functionality has been removed as it was identified as a performance bottleneck
 
-        if stop_check(): sonarr_logger.info("Stop requested after series refresh attempt."); break
-
         # Trigger search for the selected episodes in this series
         sonarr_logger.debug(f"Attempting to search for episode IDs: {episode_ids}")
         search_command_id = sonarr_api.search_episode(api_url, api_key, api_timeout, episode_ids)
 
         if search_command_id:
-            # Add episode IDs to stateful manager IMMEDIATELY after processing each batch
-            for episode_id in episode_ids:
-                # Force flush to disk by calling add_processed_id immediately for each ID
-                success = add_processed_id("sonarr", instance_name, str(episode_id))
-                sonarr_logger.debug(f"Added processed ID: {episode_id}, success: {success}")
+            # Add episode IDs to stateful manager IMMEDIATELY after processing each batch, with one write
+            success = add_processed_ids("sonarr", instance_name, [str(episode_id) for episode_id in episode_ids])
+            sonarr_logger.debug(f"Added {len(episode_ids)} processed IDs, success: {success}")
             
             # Wait for search command to complete
             if wait_for_command(
@@ -182,39 +186,32 @@ def process_missing_episodes_mode(
                 processed_any = True # Mark that we did something
                 sonarr_logger.info(f"Successfully processed and searched for {len(episode_ids)} episodes in series {series_id}.")
                 
-                # Add stats incrementing right here - this is the code path that's actually being executed
-                for episode_id in episode_ids:
-                    # Increment stat for each episode individually, just like Radarr
-                    increment_stat("sonarr", "hunted")
-                    sonarr_logger.debug(f"*** STATS INCREMENT *** sonarr hunted by 1 for episode ID {episode_id}")
+                # Count every searched episode with one stats write
+                increment_stat("sonarr", "hunted", len(episode_ids))
                 
-                # Log to history system
-                # Find the corresponding episode data for this ID
-                for episode in episodes_to_search:
-                    if episode.get('id') == episode_id:
-                        series_title = episode.get('series', {}).get('title', 'Unknown Series')
-                        episode_title = episode.get('title', 'Unknown Episode')
-                        season_number = episode.get('seasonNumber', 'Unknown Season')
-                        episode_number = episode.get('episodeNumber', 'Unknown Episode')
-                        
-                        try:
-                            season_episode = f"S{season_number:02d}E{episode_number:02d}"
-                        except (ValueError, TypeError):
-                            season_episode = f"S{season_number}E{episode_number}"
-                            
-                        media_name = f"{series_title} - {season_episode} - {episode_title}"
-                        process_id = f"{series_id}_{episode_id}"
-                        add_processed_id("sonarr", instance_name, process_id)
-                        log_processed_media("sonarr", media_name, episode_id, instance_name, "missing")
+                # Log to history system, collecting the entries so each file is written once
+                process_ids = []
+                processed_media = []
+                for episode_id in episode_ids:
+                    episode = episodes_by_id.get(episode_id)
+                    if episode is None:
+                        continue
+                    series_title = episode.get('series', {}).get('title', 'Unknown Series')
+                    episode_title = episode.get('title', 'Unknown Episode')
+                    season_number = episode.get('seasonNumber', 'Unknown Season')
+                    episode_number = episode.get('episodeNumber', 'Unknown Episode')
+                    
+                    try:
+                        season_episode = f"S{season_number:02d}E{episode_number:02d}"
+                    except (ValueError, TypeError):
+                        season_episode = f"S{season_number}E{episode_number}"
                         
-                        # Increment the stat for each episode individually (like Radarr does for movies)
-                        increment_stat("sonarr", "hunted")
-                        sonarr_logger.debug(f"Incremented sonarr hunted statistic for episode {episode_id}")
-                        break
+                    media_name = f"{series_title} - {season_episode} - {episode_title}"
+                    process_ids.append(f"{series_id}_{episode_id}")
+                    processed_media.append((media_name, episode_id))
                 
-                # The batch increment was causing issues - removing it
-                # increment_stat("sonarr", "hunted", len(episode_ids))
-                # sonarr_logger.debug(f"Incremented sonarr hunted statistics by {len(episode_ids)}")
+                add_processed_ids("sonarr", instance_name, process_ids)
+                log_processed_media_batch("sonarr", processed_media, instance_name, "missing")
             else:
                 sonarr_logger.warning(f"Episode search command (ID: {search_command_id}) for series {series_id} did not complete successfully or timed out. Episodes will not be marked as processed yet.")
         else:
@@ -247,8 +244,9 @@ def process_missing_seasons_packs_mode(
         sonarr_logger.info("No missing episodes found")
         return False
     
-    # Group episodes by series and season
-    missing_seasons = {}
+    # Count the episodes of each series and season, keeping the series title from the first episode seen
+    season_counts = {}
+    series_titles = {}
     for episode in missing_episodes:
         if monitored_only and not episode.get('monitored', False):
             continue
@@ -257,31 +255,30 @@ def process_missing_seasons_packs_mode(
         if not series_id:
             continue
             
-        season_number = episode.get('seasonNumber')
-        series_title = episode.get('series', {}).get('title', 'Unknown Series')
-        
-        key = f"{series_id}:{season_number}"
-        if key not in missing_seasons:
-            missing_seasons[key] = {
-                'series_id': series_id,
-                'season_number': season_number,
-                'series_title': series_title,
-                'episode_count': 0
-            }
-        missing_seasons[key]['episode_count'] += 1
+        key = (series_id, episode.get('seasonNumber'))
+        if key in season_counts:
+            season_counts[key] += 1
+        else:
+            season_counts[key] = 1
+            if series_id not in series_titles:
+                series_titles[series_id] = (episode.get('series') or {}).get('title', 'Unknown Series')
     
-    # Convert to list and sort by episode count (most missing episodes first)
-    seasons_list = list(missing_seasons.values())
-    seasons_list.sort(key=lambda x: x['episode_count'], reverse=True)
+    # Build one record per season and sort by episode count (most missing episodes first)
+    seasons_list = [
+        MissingSeason(series_id, season_number, series_titles[series_id], episode_count)
+        for (series_id, season_number), episode_count in season_counts.items()
+    ]
+    seasons_list.sort(key=attrgetter('episode_count'), reverse=True)
     
     # Filter out already processed seasons
+    processed_ids = get_processed_ids("sonarr", instance_name)
     unprocessed_seasons = []
     for season in seasons_list:
-        season_id = f"{season['series_id']}_{season['season_number']}"
-        if not is_processed("sonarr", instance_name, season_id):
+        season_id = f"{season.series_id}_{season.season_number}"
+        if season_id not in processed_ids:
             unprocessed_seasons.append(season)
         else:
-            sonarr_logger.debug(f"Skipping already processed season ID: {season_id}")
+            sonarr_logger.debug("Skipping already processed season ID: %s", season_id)
     
     sonarr_logger.info(f"Found {len(unprocessed_seasons)} unprocessed seasons with missing episodes out of {len(seasons_list)} total.")
     
@@ -301,7 +298,7 @@ def process_missing_seasons_packs_mode(
         sonarr_logger.info(f"Randomly selected {min(len(unprocessed_seasons), hunt_missing_items)} seasons with missing episodes:")
         
         for idx, season in enumerate(seasons_to_process):
-            sonarr_logger.info(f"  {idx+1}. {season['series_title']} - Season {season['season_number']} ({season['episode_count']} missing episodes) (Series ID: {season['series_id']})")
+            sonarr_logger.info(f"  {idx+1}. {season.series_title} - Season {season.season_number} ({season.episode_count} missing episodes) (Series ID: {season.series_id})")
     
     for season in unprocessed_seasons:
         if processed_count >= hunt_missing_items:
@@ -311,10 +308,7 @@ def process_missing_seasons_packs_mode(
             sonarr_logger.info("Stop signal received, halting processing.")
             break
             
-        series_id = season['series_id']
-        season_number = season['season_number']
-        series_title = season['series_title']
-        episode_count = season['episode_count']
+        series_id, season_number, series_title, episode_count = season
         
         # Refresh functionality has been removed as it was identified as a performance bottleneck
         
@@ -339,9 +333,7 @@ def process_missing_seasons_packs_mode(
             
             # CRITICAL FIX: Use increment_stat_only to avoid double-counting API calls
             # The API call is already tracked in search_season(), so we only increment stats here
-            from src.primary.stats_manager import increment_stat_only
-            for i in range(episode_count):
-                increment_stat_only("sonarr", "hunted")
+            increment_stat_only("sonarr", "hunted", episode_count)
             sonarr_logger.debug(f"Incremented sonarr hunted statistics for {episode_count} episodes in season pack (API call already tracked separately)")
             
             # Wait for command to complete if configured
@@ -382,13 +374,14 @@ def process_missing_shows_mode(
         return False
     
     # Filter out shows that have been processed
+    processed_ids = get_processed_ids("sonarr", instance_name)
     unprocessed_series = []
     for series in series_with_missing:
         series_id = str(series.get("series_id"))
-        if not is_processed("sonarr", instance_name, series_id):
+        if series_id not in processed_ids:
             unprocessed_series.append(series)
         else:
-            sonarr_logger.debug(f"Skipping already processed series ID: {series_id}")
+            sonarr_logger.debug("Skipping already processed series ID: %s", series_id)
     
     sonarr_logger.info(f"Found {len(unprocessed_series)} unprocessed series with missing episodes out of {len(series_with_missing)} total.")
     
@@ -456,8 +449,9 @@ def process_missing_shows_mode(
         # Series refresh functionality has been completely removed
         # No longer performing refresh before search to avoid API rate limiting and unnecessary delays
         
-        # Extract episode IDs to search
-        episode_ids = [episode.get('id') for episode in missing_episodes if episode.get('id')]
+        # Extract episode IDs to search, indexing the episodes by ID for history logging
+        episodes_by_id = {episode.get('id'): episode for episode in missing_episodes if episode.get('id')}
+        episode_ids = list(episodes_by_id)
         
         if not episode_ids:
             sonarr_logger.warning(f"No valid episode IDs found for {show_title}.")
@@ -471,38 +465,35 @@ def process_missing_shows_mode(
             processed_any = True
             sonarr_logger.info(f"Successfully processed {len(episode_ids)} missing episodes in {show_title}")
             
-            # Add episode IDs to stateful manager IMMEDIATELY after processing each batch
+            # Add episode IDs to stateful manager IMMEDIATELY after processing each batch, with one write
+            success = add_processed_ids("sonarr", instance_name, [str(episode_id) for episode_id in episode_ids])
+            sonarr_logger.debug(f"Added {len(episode_ids)} processed IDs, success: {success}")
+            
+            # Collect a history entry for each episode, written together with the show entry
+            processed_media = []
             for episode_id in episode_ids:
-                # Force flush to disk by calling add_processed_id immediately for each ID
-                success = add_processed_id("sonarr", instance_name, str(episode_id))
-                sonarr_logger.debug(f"Added processed ID: {episode_id}, success: {success}")
+                episode = episodes_by_id[episode_id]
+                season = episode.get('seasonNumber', 'Unknown')
+                ep_num = episode.get('episodeNumber', 'Unknown')
+                title = episode.get('title', 'Unknown Title')
                 
-                # Log each episode to history
-                # Find the corresponding episode data 
-                for episode in missing_episodes:
-                    if episode.get('id') == episode_id:
-                        season = episode.get('seasonNumber', 'Unknown')
-                        ep_num = episode.get('episodeNumber', 'Unknown')
-                        title = episode.get('title', 'Unknown Title')
-                        
-                        try:
-                            season_episode = f"S{season:02d}E{ep_num:02d}"
-                        except (ValueError, TypeError):
-                            season_episode = f"S{season}E{ep_num}"
-                            
-                        media_name = f"{show_title} - {season_episode} - {title}"
-                        log_processed_media("sonarr", media_name, str(episode_id), instance_name, "missing")
-                        sonarr_logger.debug(f"Logged history entry for episode: {media_name}")
-                        break
+                try:
+                    season_episode = f"S{season:02d}E{ep_num:02d}"
+                except (ValueError, TypeError):
+                    season_episode = f"S{season}E{ep_num}"
+                    
+                media_name = f"{show_title} - {season_episode} - {title}"
+                processed_media.append((media_name, str(episode_id)))
             
             # Add series ID to processed list
             success = add_processed_id("sonarr", instance_name, str(show_id))
             sonarr_logger.debug(f"Added series ID {show_id} to processed list for {instance_name}, success: {success}")
             
-            # Also log the entire show to history
+            # Also log the entire show to history, in the same write as its episodes
             media_name = f"{show_title} - Complete Series ({len(episode_ids)} episodes)"
-            log_processed_media("sonarr", media_name, str(show_id), instance_name, "missing")
-            sonarr_logger.debug(f"Logged history entry for complete series: {media_name}")
+            processed_media.append((media_name, str(show_id)))
+            log_processed_media_batch("sonarr", processed_media, instance_name, "missing")
+            sonarr_logger.debug(f"Logged {len(processed_media)} history entries for {show_title}")
             
             # Increment the hunted statistics
             increment_stat("sonarr", "hunted", len(episode_ids))
@@ -8,9 +8,9 @@ import random
 from typing import List, Dict, Any, Set, Callable, Union
 from src.primary.utils.logger import get_logger
 from src.primary.apps.sonarr import api as sonarr_api
-from src.primary.stats_manager import increment_stat
-from src.primary.stateful_manager import is_processed, add_processed_id
-from src.primary.utils.history_utils import log_processed_media
+from src.primary.stats_manager import increment_stat, increment_stat_only
+from src.primary.stateful_manager import get_processed_ids, add_processed_ids
+from src.primary.utils.history_utils import log_processed_media, log_processed_media_batch
 from src.primary.settings_manager import get_advanced_setting
 
 # Get logger for the Sonarr app
@@ -97,13 +97,14 @@ def process_upgrade_episodes_mode(
         sonarr_logger.info(f"Skipped {skipped_count} future episodes based on air date for upgrades.")
     
     # Filter out already processed episodes for random selection approach
+    processed_ids = get_processed_ids("sonarr", instance_name)
     unprocessed_episodes = []
     for episode in episodes_to_search:
         episode_id = str(episode.get("id"))
-        if not is_processed("sonarr", instance_name, episode_id):
+        if episode_id not in processed_ids:
             unprocessed_episodes.append(episode)
         else:
-            sonarr_logger.debug(f"Skipping already processed episode ID for upgrade: {episode_id}")
+            sonarr_logger.debug("Skipping already processed episode ID for upgrade: %s", episode_id)
         
     sonarr_logger.info(f"Found {len(unprocessed_episodes)} unprocessed cutoff unmet episodes out of {len(episodes_to_search)} total.")
     episodes_to_search = unprocessed_episodes
@@ -136,6 +137,9 @@ def process_upgrade_episodes_mode(
                 
             sonarr_logger.info(f" {idx+1}. {series_title} - {season_episode} - \"{episode_title}\" - Current quality: {quality_name} (ID: {episode_id})")
     
+    # Index the selected episodes by ID, their records already carry the series for history entries
+    episodes_by_id = {episode['id']: episode for episode in episodes_to_search}
+
     # Group episodes by series for potential refresh
     series_to_process: Dict[int, List[int]] = {}
     series_titles: Dict[int, str] = {} # Store titles for logging
@@ -157,10 +161,6 @@ def process_upgrade_episodes_mode(
         series_title = series_titles.get(series_id, f"Series ID {series_id}")
         sonarr_logger.info(f"Processing series for upgrades: {series_title} (ID: {series_id}) with {len(episode_ids)} episodes.")
 
-        if stop_check(): 
-            sonarr_logger.info("Stop requested during episode processing for upgrades.")
-            break
-
         # Trigger search for the selected episodes in this series
         sonarr_logger.debug(f"Attempting upgrade search for episode IDs: {episode_ids}")
         search_command_id = sonarr_api.search_episode(api_url, api_key, api_timeout, episode_ids)
@@ -175,40 +175,8 @@ def process_upgrade_episodes_mode(
                 processed_any = True # Mark that we did something
                 sonarr_logger.info(f"Successfully processed and searched for {len(episode_ids)} episodes in series {series_id}.")
                 
-                # Add stats incrementing right here - this is the code path that's actually being executed
-                for episode_id in episode_ids:
-                    # Increment stat for each episode individually, just like Radarr
-                    increment_stat("sonarr", "upgraded")
-                    sonarr_logger.debug(f"*** STATS INCREMENT *** sonarr upgraded by 1 for episode ID {episode_id}")
-                
-                # Mark episodes as processed using stateful management
-                for episode_id in episode_ids:
-                    add_processed_id("sonarr", instance_name, str(episode_id))
-                    sonarr_logger.debug(f"Marked episode ID {episode_id} as processed for upgrades")
-                    
-                    # Find the episode information for history logging
-                    # We need to get the episode details from the API to include proper info in history
-                    try:
-                        episode_details = sonarr_api.get_episode(api_url, api_key, api_timeout, episode_id)
-                        if episode_details:
-                            series_title = episode_details.get('series', {}).get('title', 'Unknown Series')
-                            episode_title = episode_details.get('title', 'Unknown Episode')
-                            season_number = episode_details.get('seasonNumber', 'Unknown Season')
-                            episode_number = episode_details.get('episodeNumber', 'Unknown Episode')
-                            
-                            try:
-                                season_episode = f"S{season_number:02d}E{episode_number:02d}"
-                            except (ValueError, TypeError):
-                                season_episode = f"S{season_number}E{episode_number}"
-                                
-                            # Record the upgrade in history with quality upgrade identifier
-                            media_name = f"{series_title} - {season_episode} - {episode_title}"
-                            # Skip logging individual episodes since we log the season pack
-                            if not skip_episode_history:
-                                log_processed_media("sonarr", media_name, episode_id, instance_name, "upgrade")
-                            sonarr_logger.debug(f"Logged quality upgrade to history for episode ID {episode_id}")
-                    except Exception as e:
-                        sonarr_logger.error(f"Failed to log history for episode ID {episode_id}: {str(e)}")
+                # Count, mark and log the upgraded episodes with one write each
+                record_upgraded_episodes(instance_name, episode_ids, episodes_by_id, increment_stat, not skip_episode_history)
             else:
                 sonarr_logger.warning(f"Episode upgrade search command (ID: {search_command_id}) for series {series_id} did not complete successfully or timed out. Episodes will not be marked as processed yet.")
         else:
@@ -217,6 +185,56 @@ def process_upgrade_episodes_mode(
     sonarr_logger.info("Finished quality cutoff upgrades processing cycle for Sonarr.")
     return processed_any
 
+def record_upgraded_episodes(
+    instance_name: str,
+    episode_ids: List[int],
+    episodes_by_id: Dict[int, Dict[str, Any]],
+    count_stat: Callable[..., bool],
+    log_history: bool = True
+) -> None:
+    """
+    Count, mark as processed and log to history the episodes of a completed upgrade search.
+    
+    Args:
+        instance_name: Name of the Sonarr instance
+        episode_ids: IDs of the searched episodes
+        episodes_by_id: The cutoff unmet records of those episodes, keyed by ID
+        count_stat: increment_stat, or increment_stat_only when the API call is tracked elsewhere
+        log_history: Whether to add a history entry for each episode
+    """
+    count_stat("sonarr", "upgraded", len(episode_ids))
+    
+    # Mark episodes as processed using stateful management, with one write
+    add_processed_ids("sonarr", instance_name, [str(episode_id) for episode_id in episode_ids])
+    sonarr_logger.debug(f"Marked {len(episode_ids)} episode IDs as processed for upgrades")
+    
+    if not log_history:
+        return
+    
+    # Collect the history entries so the history file is written once
+    processed_media = []
+    for episode_id in episode_ids:
+        try:
+            episode_details = episodes_by_id.get(episode_id)
+            if episode_details:
+                series_title = episode_details.get('series', {}).get('title', 'Unknown Series')
+                episode_title = episode_details.get('title', 'Unknown Episode')
+                season_number = episode_details.get('seasonNumber', 'Unknown Season')
+                episode_number = episode_details.get('episodeNumber', 'Unknown Episode')
+                
+                try:
+                    season_episode = f"S{season_number:02d}E{episode_number:02d}"
+                except (ValueError, TypeError):
+                    season_episode = f"S{season_number}E{episode_number}"
+                
+                # Record the upgrade in history with quality upgrade identifier
+                processed_media.append((f"{series_title} - {season_episode} - {episode_title}", episode_id))
+        except Exception as e:
+            sonarr_logger.error(f"Failed to log history for episode ID {episode_id}: {str(e)}")
+    
+    log_processed_media_batch("sonarr", processed_media, instance_name, "upgrade")
+    sonarr_logger.debug(f"Logged {len(processed_media)} quality upgrades to history")
+
 def log_season_pack_upgrade(api_url: str, api_key: str, api_timeout: int, series_id: int, season_number: int, instance_name: str):
     """Log a season pack upgrade to the history."""
     try:
@@ -338,10 +356,6 @@ def process_upgrade_seasons_mode(
         episode_ids = [episode["id"] for episode in episodes]
         
         sonarr_logger.info(f"Processing {series_title} - Season {season_number} with {len(episode_ids)} cutoff unmet episodes")
-        
-        if stop_check(): 
-            sonarr_logger.info("Stop requested during season processing.")
-            break
             
         # Trigger search for the entire season instead of individual episodes
         sonarr_logger.debug(f"Attempting to search for entire Season {season_number} of {series_title} for upgrades")
@@ -360,44 +374,12 @@ def process_upgrade_seasons_mode(
                 # Log this as a season pack upgrade in the history
                 log_season_pack_upgrade(api_url, api_key, api_timeout, series_id, season_number, instance_name)
                 
-                # We'll increment stats individually for each episode instead of in batch
-                # increment_stat("sonarr", "upgraded", len(episode_ids))
-                # sonarr_logger.debug(f"Incremented sonarr upgraded statistics by {len(episode_ids)}")
-                
-                # Mark episodes as processed using stateful management
-                for episode_id in episode_ids:
-                    add_processed_id("sonarr", instance_name, str(episode_id))
-                    sonarr_logger.debug(f"Marked episode ID {episode_id} as processed for upgrades")
-                    
-                    # CRITICAL FIX: Use increment_stat_only to avoid double-counting API calls
-                    # The API call is already tracked in search_season(), so we only increment stats here
-                    from src.primary.stats_manager import increment_stat_only
-                    increment_stat_only("sonarr", "upgraded")
-                    sonarr_logger.debug(f"Incremented sonarr upgraded statistic for episode {episode_id} (API call already tracked separately)")
-                    
-                    # Find the episode information for history logging
-                    # We need to get the episode details from the API to include proper info in history
-                    try:
-                        episode_details = sonarr_api.get_episode(api_url, api_key, api_timeout, episode_id)
-                        if episode_details:
-                            series_title = episode_details.get('series', {}).get('title', 'Unknown Series')
-                            episode_title = episode_details.get('title', 'Unknown Episode')
-                            season_number = episode_details.get('seasonNumber', 'Unknown Season')
-                            episode_number = episode_details.get('episodeNumber', 'Unknown Episode')
-                            
-                            try:
-                                season_episode = f"S{season_number:02d}E{episode_number:02d}"
-                            except (ValueError, TypeError):
-                                season_episode = f"S{season_number}E{episode_number}"
-                                
-                            # Record the upgrade in history with quality upgrade identifier
-                            media_name = f"{series_title} - {season_episode} - {episode_title}"
-                            # Skip logging individual episodes since we log the season pack
-                            if not skip_episode_history:
-                                log_processed_media("sonarr", media_name, episode_id, instance_name, "upgrade")
-                            sonarr_logger.debug(f"Logged quality upgrade to history for episode ID {episode_id}")
-                    except Exception as e:
-                        sonarr_logger.error(f"Failed to log history for episode ID {episode_id}: {str(e)}")
+                # CRITICAL FIX: Use increment_stat_only to avoid double-counting API calls
+                # The API call is already tracked in search_season(), so we only count the episodes here
+                record_upgraded_episodes(
+                    instance_name, episode_ids, {episode["id"]: episode for episode in episodes},
+                    increment_stat_only, not skip_episode_history
+                )
             else:
                 sonarr_logger.warning(f"Season pack search command for {series_title} Season {season_number} did not complete successfully")
         else:
@@ -532,42 +514,11 @@ def process_upgrade_shows_mode(
                 processed_any = True
                 sonarr_logger.info(f"Successfully processed {len(episode_ids)} cutoff unmet episodes in {series_title}")
                 
-                # We'll increment stats individually for each episode instead of in batch
-                # increment_stat("sonarr", "upgraded", len(episode_ids))
-                # sonarr_logger.debug(f"Incremented sonarr upgraded statistics by {len(episode_ids)}")
-                
-                # Mark episodes as processed using stateful management
-                for episode_id in episode_ids:
-                    add_processed_id("sonarr", instance_name, str(episode_id))
-                    sonarr_logger.debug(f"Marked episode ID {episode_id} as processed for upgrades")
-                    
-                    # Increment stats for this episode (consistent with Radarr's approach)
-                    increment_stat("sonarr", "upgraded")
-                    sonarr_logger.debug(f"Incremented sonarr upgraded statistic for episode {episode_id}")
-                    
-                    # Find the episode information for history logging
-                    # We need to get the episode details from the API to include proper info in history
-                    try:
-                        episode_details = sonarr_api.get_episode(api_url, api_key, api_timeout, episode_id)
-                        if episode_details:
-                            series_title = episode_details.get('series', {}).get('title', 'Unknown Series')
-                            episode_title = episode_details.get('title', 'Unknown Episode')
-                            season_number = episode_details.get('seasonNumber', 'Unknown Season')
-                            episode_number = episode_details.get('episodeNumber', 'Unknown Episode')
-                            
-                            try:
-                                season_episode = f"S{season_number:02d}E{episode_number:02d}"
-                            except (ValueError, TypeError):
-                                season_episode = f"S{season_number}E{episode_number}"
-                                
-                            # Record the upgrade in history with quality upgrade identifier
-                            media_name = f"{series_title} - {season_episode} - {episode_title}"
-                            # Skip logging individual episodes since we log the season pack
-                            if not skip_episode_history:
-                                log_processed_media("sonarr", media_name, episode_id, instance_name, "upgrade")
-                            sonarr_logger.debug(f"Logged quality upgrade to history for episode ID {episode_id}")
-                    except Exception as e:
-                        sonarr_logger.error(f"Failed to log history for episode ID {episode_id}: {str(e)}")
+                # Count, mark and log the upgraded episodes with one write each
+                record_upgraded_episodes(
+                    instance_name, episode_ids, {episode["id"]: episode for episode in all_series_episodes},
+                    increment_stat, not skip_episode_history
+                )
             else:
                 sonarr_logger.warning(f"Episode upgrade search command for {series_title} did not complete successfully")
         else:
@@ -141,3 +141,23 @@ def test_connection():
         error_msg = f"Connection test failed: {str(e)}"
         sonarr_logger.error(error_msg)
         return jsonify({"success": False, "message": error_msg}), 500
+
+@sonarr_bp.route('/webhook', methods=['POST'])
+def sonarr_webhook():
+    """Receive Sonarr Connect webhook events so hunted episodes are discovered without polling"""
+    # Imported here to avoid loading the discovery tracker with the blueprint
+    from src.primary.discovery_tracker import find_sonarr_instance_by_api_key, handle_sonarr_webhook
+    
+    instance = find_sonarr_instance_by_api_key(request.args.get('apikey', ''))
+    if not instance:
+        sonarr_logger.warning(f"Rejected Sonarr webhook from {request.remote_addr}: unknown API key")
+        return jsonify({"success": False, "message": "Invalid API key"}), 401
+    
+    payload = request.get_json(silent=True) or {}
+    if not isinstance(payload, dict):
+        sonarr_logger.warning(f"Rejected Sonarr webhook from {request.remote_addr}: payload is not a JSON object")
+        return jsonify({"success": False, "message": "Invalid payload"}), 400
+    
+    instance_name = instance.get("name", "Default")
+    discovered = handle_sonarr_webhook(instance_name, payload)
+    return jsonify({"success": True, "discovered": discovered}), 200
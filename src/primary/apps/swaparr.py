@@ -8,7 +8,7 @@ import os
 import json
 from src.primary.utils.logger import get_logger
 from src.primary.settings_manager import load_settings, save_settings
-from src.primary.apps.swaparr.handler import process_stalled_downloads
+from src.primary.apps.swaparr.handler import process_stalled_downloads, SWAPARR_STATE_DIR
 from src.primary.apps.radarr import get_configured_instances as get_radarr_instances
 from src.primary.apps.sonarr import get_configured_instances as get_sonarr_instances
 from src.primary.apps.lidarr import get_configured_instances as get_lidarr_instances
@@ -53,7 +53,6 @@ def get_status():
     # Get strike statistics from all app state directories
     statistics = {}
     # Use the cross-platform path from handler module
-    from src.primary.apps.swaparr.handler import SWAPARR_STATE_DIR
     state_dir = SWAPARR_STATE_DIR
     
     if os.path.exists(state_dir):
@@ -128,7 +127,6 @@ def reset_strikes():
     app_name = data.get('app_name') if data else None
     
     # Use the cross-platform path from handler module
-    from src.primary.apps.swaparr.handler import SWAPARR_STATE_DIR
     state_dir = SWAPARR_STATE_DIR
     
     if not os.path.exists(state_dir):
@@ -7,10 +7,23 @@ import os
 import json
 import time
 import hashlib
+import logging
+import threading
+from collections import namedtuple
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import requests
 
+# orjson is optional - it parses large queue pages much faster than the stdlib
+orjson_import_error = None
+try:
+    import orjson
+except ImportError as e:
+    orjson_import_error = str(e)
+
 from src.primary.utils.logger import get_logger
+from src.primary.utils.http_utils import create_arr_session
 from src.primary.settings_manager import load_settings
 from src.primary.state import get_state_file_path
 from src.primary.settings_manager import get_ssl_verify_setting
@@ -18,6 +31,24 @@ from src.primary.settings_manager import get_ssl_verify_setting
 # Create logger
 swaparr_logger = get_logger("swaparr")
 
+# Use a session so queue and delete calls reuse connections across cycles, with a
+# pool large enough for every configured instance of every app
+session = create_arr_session(pool_connections=32, pool_maxsize=64)
+
+# Recently fetched queues keyed by (app_name, api_url), so instances that point at the
+# same Starr app within a few seconds of each other share one fetch
+QUEUE_CACHE_TTL = 10  # Default seconds a fetched queue is reused
+queue_cache = {}
+queue_cache_lock = threading.Lock()
+
+# Upper bound on the queue pages of one app requested at the same time
+MAX_QUEUE_PAGE_WORKERS = 4
+
+# Queues that keep coming back empty are checked less often, skipping up to this many cycles
+IDLE_QUEUE_MAX_SKIP_CYCLES = 4
+idle_queue_counts = {}  # (app_name, api_url) -> consecutive empty queue fetches
+idle_queue_skips = {}  # (app_name, api_url) -> cycles left to skip before fetching again
+
 # Use the centralized path configuration
 from src.primary.utils.config_paths import SWAPARR_DIR
 
@@ -87,7 +118,7 @@ def save_removed_items(app_name, removed_items):
 def generate_item_hash(item):
     """Generate a unique hash for an item based on its name and size.
     This helps track items across restarts even if their queue ID changes."""
-    hash_input = f"{item['name']}_{item['size']}"
+    hash_input = f"{item.name}_{item.size}"
     return hashlib.md5(hash_input.encode('utf-8')).hexdigest()
 
 def parse_time_string_to_seconds(time_string):
@@ -143,6 +174,18 @@ def parse_size_string_to_bytes(size_string):
         swaparr_logger.error(f"Unknown size unit in: {size_string}, using default 25GB")
         return 25 * 1024 * 1024 * 1024
 
+def get_queue_page(app_name, api_url, api_version, api_key, page, page_size, api_timeout, verify_ssl):
+    """Fetch one page of a Starr app's download queue, returns the parsed response or None on error"""
+    queue_url = f"{api_url.rstrip('/')}/api/{api_version}/queue?page={page}&pageSize={page_size}"
+    headers = {'X-Api-Key': api_key}
+    try:
+        response = session.get(queue_url, headers=headers, timeout=api_timeout, verify=verify_ssl)
+        response.raise_for_status()
+        return response.json() if orjson_import_error else orjson.loads(response.content)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        swaparr_logger.error(f"Error fetching queue for {app_name} (page {page}): {str(e)}")
+        return None
+
 def get_queue_items(app_name, api_url, api_key, api_timeout=120):
     """Get download queue items from a Starr app API with pagination support"""
     api_version_map = {
@@ -154,48 +197,37 @@ def get_queue_items(app_name, api_url, api_key, api_timeout=120):
     }
     
     api_version = api_version_map.get(app_name, "v3")
-    
-    # Initialize an empty list to store all records
-    all_records = []
-    
-    # Start with page 1
-    page = 1
     page_size = 100  # Request a large page size to reduce API calls
+    verify_ssl = get_ssl_verify_setting()
+    if not verify_ssl:
+        swaparr_logger.debug("SSL verification disabled by user setting for get_queue_items")
     
-    while True:
-        # Add pagination parameters
-        queue_url = f"{api_url.rstrip('/')}/api/{api_version}/queue?page={page}&pageSize={page_size}"
-        headers = {'X-Api-Key': api_key}
-        verify_ssl = get_ssl_verify_setting()
-        if not verify_ssl:
-            swaparr_logger.debug("SSL verification disabled by user setting for get_queue_items")
-        try:
-            response = requests.get(queue_url, headers=headers, timeout=api_timeout, verify=verify_ssl)
-            response.raise_for_status()
-            queue_data = response.json()
-            
-            if api_version in ["v3"]:  # Radarr, Sonarr, Whisparr use v3
-                records = queue_data.get("records", [])
-                total_records = queue_data.get("totalRecords", 0)
-            else:  # Lidarr, Readarr use v1
-                records = queue_data
-                total_records = len(records)
-            
-            # Add this page's records to our collection
-            all_records.extend(records)
-            
-            # If we've fetched all records or there are no more, break the loop
-            if len(all_records) >= total_records or len(records) == 0:
-                break
-            
-            # Otherwise, move to the next page
-            page += 1
-            
-        except requests.exceptions.RequestException as e:
-            swaparr_logger.error(f"Error fetching queue for {app_name} (page {page}): {str(e)}")
-            break
+    # The first page reports the total, so the rest can be requested together
+    queue_data = get_queue_page(app_name, api_url, api_version, api_key, 1, page_size, api_timeout, verify_ssl)
     
-    swaparr_logger.info(f"Fetched {len(all_records)} queue items for {app_name}")
+    if queue_data is None:
+        all_records = []
+    elif api_version in ["v3"]:  # Radarr, Sonarr, Whisparr use v3
+        all_records = list(queue_data.get("records", []))
+        total_records = queue_data.get("totalRecords", 0)
+        
+        # Use the page size the app actually applied, in case it caps the requested size
+        page_size = queue_data.get("pageSize") or page_size
+        remaining_pages = range(2, -(-total_records // page_size) + 1) if all_records else range(0)
+        
+        # Each page is a separate network round trip, so fetch the remaining pages in
+        # parallel and add them in page order
+        if remaining_pages:
+            fetch_page = partial(get_queue_page, app_name, api_url, api_version, api_key,
+                                 page_size=page_size, api_timeout=api_timeout, verify_ssl=verify_ssl)
+            with ThreadPoolExecutor(max_workers=min(len(remaining_pages), MAX_QUEUE_PAGE_WORKERS)) as executor:
+                for page_data in executor.map(fetch_page, remaining_pages):
+                    if page_data is not None:
+                        all_records.extend(page_data.get("records", []))
+    else:  # Lidarr, Readarr use v1 and return the whole queue at once
+        all_records = queue_data
+    
+    swaparr_logger.info("Fetched %d queue items for %s", len(all_records), app_name)
     
     # Normalize the response based on app type
     if app_name in ["radarr", "whisparr", "eros"]:
@@ -210,51 +242,96 @@ def get_queue_items(app_name, api_url, api_key, api_timeout=120):
         swaparr_logger.error(f"Unknown app type: {app_name}")
         return []
 
+def get_cached_queue_items(app_name, api_url, api_key, api_timeout=120, ttl=QUEUE_CACHE_TTL):
+    """Get download queue items, reusing a fetch of the same queue from the last ttl seconds"""
+    cache_key = (app_name, api_url.rstrip('/'))
+    
+    with queue_cache_lock:
+        cache_entry = queue_cache.get(cache_key)
+        if cache_entry and time.time() - cache_entry['timestamp'] < ttl:
+            swaparr_logger.debug("Using cached queue for %s at %s", app_name, api_url)
+            return cache_entry['data']
+    
+    queue_items = get_queue_items(app_name, api_url, api_key, api_timeout)
+    
+    now = time.time()
+    with queue_cache_lock:
+        # Drop expired queues while here, so instances removed from the settings don't keep theirs in memory
+        for expired_key in [key for key, entry in queue_cache.items() if now - entry['timestamp'] >= ttl]:
+            del queue_cache[expired_key]
+        queue_cache[cache_key] = {'timestamp': now, 'data': queue_items}
+    return queue_items
+
+def invalidate_queue_cache(app_name, api_url):
+    """Drop the cached queue for an app, after it has been changed"""
+    with queue_cache_lock:
+        queue_cache.pop((app_name, api_url.rstrip('/')), None)
+
+# Standardized queue item, a namedtuple since one is built for every record on every cycle
+QueueItem = namedtuple("QueueItem", ["id", "name", "size", "status", "eta", "error_message"])
+
+# Fallback title used when a queue record's media object has no title, by item type
+ITEM_TYPE_DEFAULT_TITLES = {
+    "movie": "Unknown Movie",
+    "series": "Unknown Series",
+    "album": "Unknown Album",
+    "book": "Unknown Book"
+}
+
+def new_strike_record(name, first_strike_time):
+    """Create the strike data kept for a download that has not been striked yet"""
+    return {
+        "strikes": 0,
+        "name": name,
+        "first_strike_time": first_strike_time,
+        "last_strike_time": None
+    }
+
+def parse_timeleft_to_seconds(timeleft):
+    """Parse a queue timeleft string like "00:30:00" or "1.02:30:00" (with days) to seconds, 0 if unknown"""
+    if not timeleft:
+        return 0
+    try:
+        hours, minutes, seconds = timeleft.split(':')
+        days, _, hours = hours.rpartition('.')
+        return int(days or 0) * 86400 + int(hours) * 3600 + int(minutes) * 60 + int(float(seconds))
+    except ValueError:
+        return 0
+
 def parse_queue_items(records, item_type, app_name):
     """Parse queue items from API response into a standardized format"""
     queue_items = []
     
+    # Resolve the item type once instead of for every record
+    default_title = ITEM_TYPE_DEFAULT_TITLES.get(item_type)
+    
     for record in records:
         # Skip non-dictionary records
         if not isinstance(record, dict):
-            swaparr_logger.warning(f"Skipping non-dictionary record in {app_name} queue: {record}")
+            swaparr_logger.warning("Skipping non-dictionary record in %s queue: %s", app_name, record)
             continue
+        
+        # Bind the lookup once since every field below is read through it
+        get = record.get
             
         # Extract the name based on the item type
         name = None
-        if item_type == "movie" and record.get("movie"):
-            name = record["movie"].get("title", "Unknown Movie")
-        elif item_type == "series" and record.get("series"):
-            name = record["series"].get("title", "Unknown Series")
-        elif item_type == "album" and record.get("album"):
-            name = record["album"].get("title", "Unknown Album")
-        elif item_type == "book" and record.get("book"):
-            name = record["book"].get("title", "Unknown Book")
+        media = get(item_type) if default_title else None
+        if media:
+            name = media.get("title", default_title)
         
         # If no name was found, try to use the download title
-        if not name and record.get("title"):
-            name = record.get("title", "Unknown Download")
+        if not name:
+            name = get("title") or None
         
-        # Parse ETA if available
-        eta_seconds = 0
-        if record.get("timeleft"):
-            eta = record.get("timeleft", "")
-            # Basic parsing of timeleft format like "00:30:00" (30 minutes)
-            try:
-                eta_parts = eta.split(':')
-                if len(eta_parts) == 3:
-                    eta_seconds = int(eta_parts[0]) * 3600 + int(eta_parts[1]) * 60 + int(eta_parts[2])
-            except (ValueError, IndexError):
-                eta_seconds = 0
-        
-        queue_items.append({
-            "id": record.get("id"),
-            "name": name,
-            "size": record.get("size", 0),
-            "status": record.get("status", "unknown").lower(),
-            "eta": eta_seconds,
-            "error_message": record.get("errorMessage", "")
-        })
+        queue_items.append(QueueItem(
+            id=get("id"),
+            name=name,
+            size=get("size", 0),
+            status=get("status", "unknown").lower(),
+            eta=parse_timeleft_to_seconds(get("timeleft")),
+            error_message=get("errorMessage", "")
+        ))
     
     return queue_items
 
@@ -275,9 +352,10 @@ def delete_download(app_name, api_url, api_key, download_id, remove_from_client=
     if not verify_ssl:
         swaparr_logger.debug("SSL verification disabled by user setting for delete_download")
     try:
-        response = requests.delete(delete_url, headers=headers, timeout=api_timeout, verify=verify_ssl)
+        response = session.delete(delete_url, headers=headers, timeout=api_timeout, verify=verify_ssl)
         response.raise_for_status()
-        swaparr_logger.info(f"Successfully removed download {download_id} from {app_name}")
+        swaparr_logger.info("Successfully removed download %s from %s", download_id, app_name)
+        invalidate_queue_cache(app_name, api_url)
         return True
     except requests.exceptions.RequestException as e:
         swaparr_logger.error(f"Error removing download {download_id} from {app_name}: {str(e)}")
@@ -289,10 +367,10 @@ def process_stalled_downloads(app_name, app_settings, swaparr_settings=None):
         swaparr_settings = load_settings("swaparr")
     
     if not swaparr_settings or not swaparr_settings.get("enabled", False):
-        swaparr_logger.debug(f"Swaparr is disabled, skipping {app_name} instance: {app_settings.get('instance_name', 'Unknown')}")
+        swaparr_logger.debug("Swaparr is disabled, skipping %s instance: %s", app_name, app_settings.get('instance_name', 'Unknown'))
         return
     
-    swaparr_logger.info(f"Processing stalled downloads for {app_name} instance: {app_settings.get('instance_name', 'Unknown')}")
+    swaparr_logger.info("Processing stalled downloads for %s instance: %s", app_name, app_settings.get('instance_name', 'Unknown'))
     
     # Get settings
     max_strikes = swaparr_settings.get("max_strikes", 3)
@@ -315,35 +393,57 @@ def process_stalled_downloads(app_name, app_settings, swaparr_settings=None):
     # Load list of permanently removed items
     removed_items = load_removed_items(app_name)
     
+    # Each file is only written back when this run changes it
+    strikes_changed = False
+    removed_changed = False
+    
     # Clean up expired removed items (older than 30 days)
     now = datetime.utcnow()
     for item_hash in list(removed_items.keys()):
         removed_date = datetime.fromisoformat(removed_items[item_hash]["removed_time"].replace('Z', '+00:00'))
         if (now - removed_date) > timedelta(days=30):
-            swaparr_logger.debug(f"Removing expired entry from removed items list: {removed_items[item_hash]['name']}")
+            swaparr_logger.debug("Removing expired entry from removed items list: %s", removed_items[item_hash]['name'])
             del removed_items[item_hash]
+            removed_changed = True
+    
+    # Skip idle instances for a few cycles, backing off further while they stay empty
+    idle_key = (app_name, api_url.rstrip('/'))
+    if idle_queue_skips.get(idle_key, 0) > 0:
+        idle_queue_skips[idle_key] -= 1
+        swaparr_logger.debug("Queue for %s instance %s was empty for %d checks, skipping this cycle", app_name, app_settings.get('instance_name', 'Unknown'), idle_queue_counts[idle_key])
+        return
     
     # Get current queue items
-    queue_items = get_queue_items(app_name, api_url, api_key, api_timeout)
+    queue_items = get_cached_queue_items(app_name, api_url, api_key, api_timeout, swaparr_settings.get("queue_cache_ttl", QUEUE_CACHE_TTL))
     
     if not queue_items:
-        swaparr_logger.info(f"No queue items found for {app_name} instance: {app_settings.get('instance_name', 'Unknown')}")
+        idle_queue_counts[idle_key] = idle_count = idle_queue_counts.get(idle_key, 0) + 1
+        idle_queue_skips[idle_key] = min(IDLE_QUEUE_MAX_SKIP_CYCLES, 2 ** (idle_count - 1))
+        swaparr_logger.info("No queue items found for %s instance: %s", app_name, app_settings.get('instance_name', 'Unknown'))
         return
     
-    # Keep track of items still in queue for cleanup
-    current_item_ids = set(item["id"] for item in queue_items)
+    idle_queue_counts.pop(idle_key, None)
+    
+    # Keep track of items still in queue for cleanup, as strings to match the strike data keys
+    current_item_ids = {str(item.id) for item in queue_items}
     
     # Clean up items that are no longer in the queue
     for item_id in list(strike_data.keys()):
-        if int(item_id) not in current_item_ids:
-            swaparr_logger.debug(f"Removing item {item_id} from strike list as it's no longer in the queue")
+        if item_id not in current_item_ids:
+            swaparr_logger.debug("Removing item %s from strike list as it's no longer in the queue", item_id)
             del strike_data[item_id]
+            strikes_changed = True
+    
+    # One timestamp for every change made in this run, instead of formatting the clock per use
+    now_iso = now.isoformat()
     
     # Process each queue item
     for item in queue_items:
-        item_id = str(item["id"])
+        item_id = str(item.id)
         item_state = "Normal"
-        item_hash = generate_item_hash(item)
+        # Only hash the item when there are removed downloads to compare it with,
+        # which in a healthy queue is almost never
+        item_hash = generate_item_hash(item) if removed_items else None
         
         # Check if this item has been previously removed
         if item_hash in removed_items:
@@ -352,65 +452,55 @@ def process_stalled_downloads(app_name, app_settings, swaparr_settings=None):
             
             # Re-remove it automatically if it's been less than 7 days since last removal
             if days_since_removal < 7:
-                swaparr_logger.warning(f"Found previously removed download that reappeared: {item['name']} (removed {days_since_removal} days ago)")
+                swaparr_logger.warning("Found previously removed download that reappeared: %s (removed %d days ago)", item.name, days_since_removal)
                 
                 if not dry_run:
-                    if delete_download(app_name, api_url, api_key, item["id"], remove_from_client, api_timeout):
-                        swaparr_logger.info(f"Re-removed previously removed download: {item['name']}")
+                    if delete_download(app_name, api_url, api_key, item.id, remove_from_client, api_timeout):
+                        swaparr_logger.info("Re-removed previously removed download: %s", item.name)
                         # Update the removal time
-                        removed_items[item_hash]["removed_time"] = datetime.utcnow().isoformat()
+                        removed_items[item_hash]["removed_time"] = now_iso
+                        removed_changed = True
                 else:
-                    swaparr_logger.info(f"DRY RUN: Would have re-removed previously removed download: {item['name']}")
+                    swaparr_logger.info("DRY RUN: Would have re-removed previously removed download: %s", item.name)
                 
-                item_state = "Re-removed" if not dry_run else "Would Re-remove (Dry Run)"
                 continue
         
         # Skip large files if configured
-        if item["size"] >= ignore_above_size:
-            swaparr_logger.debug(f"Ignoring large download: {item['name']} ({item['size']} bytes > {ignore_above_size} bytes)")
-            item_state = "Ignored (Size)"
+        if item.size >= ignore_above_size:
+            swaparr_logger.debug("Ignoring large download: %s (%s bytes > %s bytes)", item.name, item.size, ignore_above_size)
             continue
         
         # Handle delayed items - we'll skip these
-        if item["status"] == "delay":
-            swaparr_logger.debug(f"Ignoring delayed download: {item['name']}")
-            item_state = "Ignored (Delayed)"
+        if item.status == "delay":
+            swaparr_logger.debug("Ignoring delayed download: %s", item.name)
             continue
         
         # Special handling for "queued" status
         # We only skip truly queued items, not those with metadata issues
-        metadata_issue = "metadata" in item["status"].lower() or "metadata" in item["error_message"].lower()
+        # (the status is already lowercased when the queue is parsed)
+        metadata_issue = "metadata" in item.status or "metadata" in item.error_message.lower()
+        item_strikes = strike_data.get(item_id)
         
-        if item["status"] == "queued" and not metadata_issue:
+        if item.status == "queued" and not metadata_issue:
             # For regular queued items, check how long they've been in strike data
-            if item_id in strike_data and "first_strike_time" in strike_data[item_id]:
-                first_strike = datetime.fromisoformat(strike_data[item_id]["first_strike_time"].replace('Z', '+00:00'))
+            if item_strikes and "first_strike_time" in item_strikes:
+                first_strike = datetime.fromisoformat(item_strikes["first_strike_time"].replace('Z', '+00:00'))
                 if (now - first_strike) < timedelta(hours=1):
                     # Skip if it's been less than 1 hour since first seeing it
-                    swaparr_logger.debug(f"Ignoring recently queued download: {item['name']}")
-                    item_state = "Ignored (Recently Queued)"
+                    swaparr_logger.debug("Ignoring recently queued download: %s", item.name)
                     continue
             else:
                 # Initialize with first strike time for queued items
-                if item_id not in strike_data:
-                    strike_data[item_id] = {
-                        "strikes": 0,
-                        "name": item["name"],
-                        "first_strike_time": datetime.utcnow().isoformat(),
-                        "last_strike_time": None
-                    }
-                swaparr_logger.debug(f"Monitoring new queued download: {item['name']}")
-                item_state = "Monitoring (Queued)"
+                if item_strikes is None:
+                    strike_data[item_id] = new_strike_record(item.name, now_iso)
+                    strikes_changed = True
+                swaparr_logger.debug("Monitoring new queued download: %s", item.name)
                 continue
         
         # Initialize strike count if not already in strike data
-        if item_id not in strike_data:
-            strike_data[item_id] = {
-                "strikes": 0,
-                "name": item["name"],
-                "first_strike_time": datetime.utcnow().isoformat(),
-                "last_strike_time": None
-            }
+        if item_strikes is None:
+            strike_data[item_id] = item_strikes = new_strike_record(item.name, now_iso)
+            strikes_changed = True
         
         # Check if download should be striked
         should_strike = False
@@ -420,56 +510,60 @@ def process_stalled_downloads(app_name, app_settings, swaparr_settings=None):
         if metadata_issue:
             should_strike = True
             strike_reason = "Metadata"
-        elif item["eta"] >= max_download_time:
+        elif item.eta >= max_download_time:
             should_strike = True
             strike_reason = "ETA too long"
-        elif item["eta"] == 0 and item["status"] not in ["queued", "delay"]:
+        elif item.eta == 0 and item.status not in {"queued", "delay"}:
             should_strike = True
             strike_reason = "No progress"
         
         # If we should strike this item, add a strike
         if should_strike:
-            strike_data[item_id]["strikes"] += 1
-            strike_data[item_id]["last_strike_time"] = datetime.utcnow().isoformat()
+            item_strikes["strikes"] = current_strikes = item_strikes["strikes"] + 1
+            item_strikes["last_strike_time"] = now_iso
+            strikes_changed = True
             
-            if strike_data[item_id]["first_strike_time"] is None:
-                strike_data[item_id]["first_strike_time"] = datetime.utcnow().isoformat()
+            if item_strikes["first_strike_time"] is None:
+                item_strikes["first_strike_time"] = now_iso
             
-            current_strikes = strike_data[item_id]["strikes"]
-            swaparr_logger.info(f"Added strike ({current_strikes}/{max_strikes}) to {item['name']} - Reason: {strike_reason}")
+            swaparr_logger.info("Added strike (%d/%d) to %s - Reason: %s", current_strikes, max_strikes, item.name, strike_reason)
             
             # If max strikes reached, remove the download
             if current_strikes >= max_strikes:
-                swaparr_logger.warning(f"Max strikes reached for {item['name']}, removing download")
+                swaparr_logger.warning("Max strikes reached for %s, removing download", item.name)
                 
                 if not dry_run:
-                    if delete_download(app_name, api_url, api_key, item["id"], remove_from_client, api_timeout):
-                        swaparr_logger.info(f"Successfully removed {item['name']} after {max_strikes} strikes")
+                    if delete_download(app_name, api_url, api_key, item.id, remove_from_client, api_timeout):
+                        swaparr_logger.info("Successfully removed %s after %d strikes", item.name, max_strikes)
                         
                         # Keep the item in strike data for reference but mark as removed
-                        strike_data[item_id]["removed"] = True
-                        strike_data[item_id]["removed_time"] = datetime.utcnow().isoformat()
+                        item_strikes["removed"] = True
+                        item_strikes["removed_time"] = now_iso
                         
                         # Add to removed items list for persistent tracking
-                        removed_items[item_hash] = {
-                            "name": item["name"],
-                            "size": item["size"],
-                            "removed_time": datetime.utcnow().isoformat(),
+                        removed_items[item_hash or generate_item_hash(item)] = {
+                            "name": item.name,
+                            "size": item.size,
+                            "removed_time": now_iso,
                             "reason": strike_reason
                         }
+                        removed_changed = True
                 else:
-                    swaparr_logger.info(f"DRY RUN: Would have removed {item['name']} after {max_strikes} strikes")
+                    swaparr_logger.info("DRY RUN: Would have removed %s after %d strikes", item.name, max_strikes)
                 
                 item_state = "Removed" if not dry_run else "Would Remove (Dry Run)"
-            else:
+            elif swaparr_logger.isEnabledFor(logging.DEBUG):
+                # The state is only used for the debug log below
                 item_state = f"Striked ({current_strikes}/{max_strikes})"
         
-        swaparr_logger.debug(f"Processed download: {item['name']} - State: {item_state}")
+        swaparr_logger.debug("Processed download: %s - State: %s", item.name, item_state)
     
     # Save updated strike data
-    save_strike_data(app_name, strike_data)
+    if strikes_changed:
+        save_strike_data(app_name, strike_data)
     
     # Save updated removed items list
-    save_removed_items(app_name, removed_items)
+    if removed_changed:
+        save_removed_items(app_name, removed_items)
     
-    swaparr_logger.info(f"Finished processing stalled downloads for {app_name} instance: {app_settings.get('instance_name', 'Unknown')}")
+    swaparr_logger.info("Finished processing stalled downloads for %s instance: %s", app_name, app_settings.get('instance_name', 'Unknown'))
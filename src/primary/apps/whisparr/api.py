@@ -14,13 +14,14 @@ import traceback
 import sys
 from typing import List, Dict, Any, Optional, Union, Callable
 from src.primary.utils.logger import get_logger
+from src.primary.utils.http_utils import create_arr_session
 from src.primary.settings_manager import get_ssl_verify_setting
 
 # Get logger for the Whisparr app
 whisparr_logger = get_logger("whisparr")
 
 # Use a session for better performance
-session = requests.Session()
+session = create_arr_session()
 
 def arr_request(api_url: str, api_key: str, api_timeout: int, endpoint: str, method: str = "GET", data: Dict = None) -> Any:
     """
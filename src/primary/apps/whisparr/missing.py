@@ -13,9 +13,9 @@ from typing import List, Dict, Any, Set, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.whisparr import api as whisparr_api
 from src.primary.settings_manager import load_settings, get_advanced_setting
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import get_processed_ids, add_processed_id
 from src.primary.stats_manager import increment_stat
-from src.primary.utils.history_utils import log_processed_media
+from src.primary.utils.history_utils import log_processed_media_batch
 from src.primary.state import check_state_reset
 
 # Get logger for the app
@@ -114,13 +114,14 @@ def process_missing_items(
         return False
         
     # Filter out already processed items using stateful management
+    processed_ids = get_processed_ids("whisparr", instance_name)
     unprocessed_items = []
     for item in missing_items:
         item_id = str(item.get("id"))
-        if not is_processed("whisparr", instance_name, item_id):
+        if item_id not in processed_ids:
             unprocessed_items.append(item)
         else:
-            whisparr_logger.debug(f"Skipping already processed item ID: {item_id}")
+            whisparr_logger.debug("Skipping already processed item ID: %s", item_id)
     
     whisparr_logger.info(f"Found {len(unprocessed_items)} unprocessed items out of {len(missing_items)} total items with missing files.")
     
@@ -130,6 +131,7 @@ def process_missing_items(
         
     items_processed = 0
     processing_done = False
+    processed_media = []
     
     # Select items to search based on configuration
     whisparr_logger.info(f"Randomly selecting up to {hunt_missing_items} missing items.")
@@ -173,10 +175,8 @@ def process_missing_items(
         if search_command_id:
             whisparr_logger.info(f"Triggered search command {search_command_id}. Assuming success for now.")
             
-            # Log to history system
-            media_name = f"{title} - {season_episode}"
-            log_processed_media("whisparr", media_name, item_id, instance_name, "missing")
-            whisparr_logger.debug(f"Logged history entry for item: {media_name}")
+            # Collect for the history log, written once after the loop
+            processed_media.append((f"{title} - {season_episode}", item_id))
             
             items_processed += 1
             processing_done = True
@@ -193,6 +193,11 @@ def process_missing_items(
             # Do not mark as processed if search couldn't be triggered
             continue
     
+    # Log all searched items to history with a single write
+    if processed_media:
+        log_processed_media_batch("whisparr", processed_media, instance_name, "missing")
+        whisparr_logger.debug(f"Logged {len(processed_media)} history entries for {instance_name}")
+    
     # Log final status
     if items_processed > 0:
         whisparr_logger.info(f"Completed processing {items_processed} missing items for this cycle.")
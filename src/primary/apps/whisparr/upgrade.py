@@ -13,9 +13,9 @@ from datetime import datetime, timedelta
 from src.primary.utils.logger import get_logger
 from src.primary.apps.whisparr import api as whisparr_api
 from src.primary.settings_manager import load_settings, get_advanced_setting
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import get_processed_ids, add_processed_id
 from src.primary.stats_manager import increment_stat
-from src.primary.utils.history_utils import log_processed_media
+from src.primary.utils.history_utils import log_processed_media_batch
 from src.primary.state import check_state_reset
 
 # Get logger for the app
@@ -88,13 +88,14 @@ def process_cutoff_upgrades(
     whisparr_logger.info(f"Found {len(upgrade_eligible_data)} items eligible for quality upgrade.")
     
     # Filter out already processed items using stateful management
+    processed_ids = get_processed_ids("whisparr", instance_name)
     unprocessed_items = []
     for item in upgrade_eligible_data:
         item_id = str(item.get("id"))
-        if not is_processed("whisparr", instance_name, item_id):
+        if item_id not in processed_ids:
             unprocessed_items.append(item)
         else:
-            whisparr_logger.debug(f"Skipping already processed item ID: {item_id}")
+            whisparr_logger.debug("Skipping already processed item ID: %s", item_id)
     
     whisparr_logger.info(f"Found {len(unprocessed_items)} unprocessed items out of {len(upgrade_eligible_data)} total items eligible for quality upgrade.")
     
@@ -104,6 +105,7 @@ def process_cutoff_upgrades(
     
     items_processed = 0
     processing_done = False
+    processed_media = []
     
     # Always use random selection for upgrades
     whisparr_logger.info(f"Randomly selecting up to {hunt_upgrade_items} items for quality upgrade.")
@@ -135,11 +137,6 @@ def process_cutoff_upgrades(
         
         # Refresh functionality has been removed as it was identified as a performance bottleneck
         
-        # Check for stop signal before searching
-        if stop_check():
-            whisparr_logger.info(f"Stop requested before searching for {title}. Aborting...")
-            break
-        
         # Mark the item as processed BEFORE triggering any searches
         add_processed_id("whisparr", instance_name, str(item_id))
         whisparr_logger.debug(f"Added item ID {item_id} to processed list for {instance_name}")
@@ -150,11 +147,9 @@ def process_cutoff_upgrades(
         if search_command_id:
             whisparr_logger.info(f"Triggered search command {search_command_id}. Assuming success for now.")
             
-            # Log to history so the upgrade appears in the history UI
+            # Collect for the history log, written once after the loop
             series_title = item.get("series", {}).get("title", "Unknown Series")
-            media_name = f"{series_title} - {season_episode} - {title}"
-            log_processed_media("whisparr", media_name, item_id, instance_name, "upgrade")
-            whisparr_logger.debug(f"Logged quality upgrade to history for item ID {item_id}")
+            processed_media.append((f"{series_title} - {season_episode} - {title}", item_id))
             
             items_processed += 1
             processing_done = True
@@ -171,6 +166,11 @@ def process_cutoff_upgrades(
             # Do not mark as processed if search couldn't be triggered
             continue
     
+    # Log all upgrade searches to history with a single write
+    if processed_media:
+        log_processed_media_batch("whisparr", processed_media, instance_name, "upgrade")
+        whisparr_logger.debug(f"Logged {len(processed_media)} quality upgrades to history for {instance_name}")
+    
     # Log final status
     if items_processed > 0:
         whisparr_logger.info(f"Completed processing {items_processed} items for quality upgrade for this cycle.")
@@ -267,6 +267,7 @@ def authenticate_request():
     api_setup_path = "/api/setup"
     favicon_path = "/favicon.ico"
     health_check_path = "/api/health"
+    webhook_path = "/api/sonarr/webhook"
 
     # Skip authentication for static files, setup pages and health check path
     if request.path.startswith((static_path, setup_path, api_setup_path)) or request.path in (favicon_path, health_check_path):
@@ -280,6 +281,10 @@ def authenticate_request():
     if request.path.startswith((login_path, api_login_path)):
         return None
     
+    # Skip session authentication for Sonarr webhooks - the route checks the instance API key itself
+    if request.path == webhook_path:
+        return None
+    
     # Load general settings
     local_access_bypass = False
     proxy_auth_bypass = False
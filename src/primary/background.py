@@ -15,6 +15,7 @@ import threading
 from typing import Dict, List, Optional, Callable, Union, Tuple
 import datetime
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 # Define the version number
 __version__ = "1.0.0" # Consider updating this based on changes
@@ -28,7 +29,9 @@ hunting_logger = get_logger("hunting")  # Add hunting logger for Hunt Manager lo
 from src.primary import config, settings_manager
 # Removed keys_manager import as settings_manager handles API details
 from src.primary.state import check_state_reset, calculate_reset_time
-from src.primary.stats_manager import check_hourly_cap_exceeded
+from src.primary.stats_manager import check_hourly_cap_exceeded, get_hourly_cap_status, reset_hourly_caps
+from src.primary.cycle_tracker import start_cycle, end_cycle, update_next_cycle
+from src.primary.utils.config_paths import get_reset_path
 # Instance list generator has been removed
 from src.primary.scheduler_engine import start_scheduler, stop_scheduler
 from src.primary.migrate_configs import migrate_json_configs  # Import the migration function
@@ -43,6 +46,49 @@ hourly_cap_scheduler_thread = None
 
 # Instance list generator has been removed
 
+# Processing functions and hunt count settings for each app:
+# app_type -> (missing function, upgrade function, missing setting, upgrade setting)
+APP_PROCESSORS = {
+    "sonarr": ("process_missing_episodes", "process_cutoff_upgrades", "hunt_missing_items", "hunt_upgrade_items"),
+    "radarr": ("process_missing_movies", "process_cutoff_upgrades", "hunt_missing_movies", "hunt_upgrade_movies"),
+    "lidarr": ("process_missing_albums", "process_cutoff_upgrades", "hunt_missing_items", "hunt_upgrade_items"),
+    "readarr": ("process_missing_books", "process_cutoff_upgrades", "hunt_missing_books", "hunt_upgrade_books"),
+    "whisparr": ("process_missing_scenes", "process_cutoff_upgrades", "hunt_missing_items", "hunt_upgrade_items"),
+    "eros": ("process_missing_items", "process_cutoff_upgrades", "hunt_missing_items", "hunt_upgrade_items"),
+}
+
+# Upper bound on the instances of one app that are connection checked at the same time
+MAX_CONNECTION_CHECK_WORKERS = 8
+
+def check_instance_connections(app_type: str, instances: List[Dict], check_connection: Callable, api_timeout: int, app_logger: logging.Logger) -> List[bool]:
+    """
+    Check the connection to every instance of an app in parallel.
+
+    Each check is a blocking HTTP request, so running them together makes the
+    cycle wait for the slowest instance instead of the sum of all of them.
+
+    Returns:
+        A list of connection results in the same order as instances
+    """
+    def check_instance(instance_details: Dict) -> bool:
+        instance_name = instance_details.get("instance_name", "Default")
+        api_url = instance_details.get("api_url", "")
+        api_key = instance_details.get("api_key", "")
+        if not api_url or not api_key:
+            return False
+        try:
+            app_logger.debug(f"Checking connection to {app_type} instance '{instance_name}' at {api_url} with timeout {api_timeout}s")
+            return bool(check_connection(api_url, api_key, api_timeout=api_timeout))
+        except Exception as e:
+            app_logger.error(f"Error connecting to {app_type} instance '{instance_name}': {e}", exc_info=True)
+            return False
+
+    if len(instances) == 1:
+        return [check_instance(instances[0])]
+
+    with ThreadPoolExecutor(max_workers=min(len(instances), MAX_CONNECTION_CHECK_WORKERS)) as executor:
+        return list(executor.map(check_instance, instances))
+
 def app_specific_loop(app_type: str) -> None:
     """
     Main processing loop for a specific Arr application.
@@ -81,54 +127,14 @@ def app_specific_loop(app_type: str) -> None:
         check_connection = getattr(api_module, 'check_connection')
         get_queue_size = getattr(api_module, 'get_download_queue_size', lambda api_url, api_key, api_timeout: 0) # Default if not found
 
-        if app_type == "sonarr":
-            missing_module = importlib.import_module('src.primary.apps.sonarr.missing')
-            upgrade_module = importlib.import_module('src.primary.apps.sonarr.upgrade')
-            process_missing = getattr(missing_module, 'process_missing_episodes')
-            process_upgrades = getattr(upgrade_module, 'process_cutoff_upgrades')
-            hunt_missing_setting = "hunt_missing_items"
-            hunt_upgrade_setting = "hunt_upgrade_items"
-        elif app_type == "radarr":
-            missing_module = importlib.import_module('src.primary.apps.radarr.missing')
-            upgrade_module = importlib.import_module('src.primary.apps.radarr.upgrade')
-            process_missing = getattr(missing_module, 'process_missing_movies')
-            process_upgrades = getattr(upgrade_module, 'process_cutoff_upgrades')
-            hunt_missing_setting = "hunt_missing_movies"
-            hunt_upgrade_setting = "hunt_upgrade_movies"
-        elif app_type == "lidarr":
-            missing_module = importlib.import_module('src.primary.apps.lidarr.missing')
-            upgrade_module = importlib.import_module('src.primary.apps.lidarr.upgrade')
-            # Use process_missing_albums as the function name
-            process_missing = getattr(missing_module, 'process_missing_albums') 
-            process_upgrades = getattr(upgrade_module, 'process_cutoff_upgrades')
-            hunt_missing_setting = "hunt_missing_items"
-            # Use hunt_upgrade_items
-            hunt_upgrade_setting = "hunt_upgrade_items" 
-        elif app_type == "readarr":
-            missing_module = importlib.import_module('src.primary.apps.readarr.missing')
-            upgrade_module = importlib.import_module('src.primary.apps.readarr.upgrade')
-            process_missing = getattr(missing_module, 'process_missing_books')
-            process_upgrades = getattr(upgrade_module, 'process_cutoff_upgrades')
-            hunt_missing_setting = "hunt_missing_books"
-            hunt_upgrade_setting = "hunt_upgrade_books"
-        elif app_type == "whisparr":
-            missing_module = importlib.import_module('src.primary.apps.whisparr.missing')
-            upgrade_module = importlib.import_module('src.primary.apps.whisparr.upgrade')
-            process_missing = getattr(missing_module, 'process_missing_scenes')
-            process_upgrades = getattr(upgrade_module, 'process_cutoff_upgrades')
-            hunt_missing_setting = "hunt_missing_items"  # Updated to new name
-            hunt_upgrade_setting = "hunt_upgrade_items"  # Updated to new name
-        elif app_type == "eros":
-            missing_module = importlib.import_module('src.primary.apps.eros.missing')
-            upgrade_module = importlib.import_module('src.primary.apps.eros.upgrade')
-            process_missing = getattr(missing_module, 'process_missing_items')
-            process_upgrades = getattr(upgrade_module, 'process_cutoff_upgrades')
-            hunt_missing_setting = "hunt_missing_items"
-            hunt_upgrade_setting = "hunt_upgrade_items"
-        else:
+        if app_type not in APP_PROCESSORS:
             app_logger.error(f"Unsupported app_type: {app_type}")
             return # Exit thread if app type is invalid
 
+        missing_func_name, upgrade_func_name, hunt_missing_setting, hunt_upgrade_setting = APP_PROCESSORS[app_type]
+        process_missing = getattr(missing_module, missing_func_name)
+        process_upgrades = getattr(upgrade_module, upgrade_func_name)
+
     except (ImportError, AttributeError) as e:
         app_logger.error(f"Failed to import modules or functions for {app_type}: {e}", exc_info=True)
         return # Exit thread if essential modules fail to load
@@ -150,6 +156,10 @@ def app_specific_loop(app_type: str) -> None:
             sleep_duration = app_settings.get("sleep_duration", 900)
             api_timeout = app_settings.get("api_timeout", 120) # Default to 120 seconds
 
+            # General and Swaparr settings are shared by every instance in this cycle
+            general_settings = settings_manager.load_settings('general')
+            swaparr_settings = settings_manager.load_settings("swaparr")
+
         except Exception as e:
             app_logger.error(f"Error loading settings for cycle: {e}", exc_info=True)
             stop_event.wait(60) # Wait before retrying
@@ -162,7 +172,6 @@ def app_specific_loop(app_type: str) -> None:
 
         # Mark cycle as started (set cyclelock to True)
         try:
-            from src.primary.cycle_tracker import start_cycle
             start_cycle(app_type)
         except Exception as e:
             app_logger.warning(f"Failed to mark cycle start for {app_type}: {e}")
@@ -213,9 +222,12 @@ def app_specific_loop(app_type: str) -> None:
             stop_event.wait(sleep_duration)
             continue
             
+        # Check the connection to all instances up front, in parallel
+        instance_connections = check_instance_connections(app_type, instances_to_process, check_connection, api_timeout, app_logger)
+
         # Process each instance dictionary returned by get_configured_instances
         processed_any_items = False
-        for instance_details in instances_to_process:
+        for instance_details, connected in zip(instances_to_process, instance_connections):
             if stop_event.is_set():
                 break
                 
@@ -233,24 +245,16 @@ def app_specific_loop(app_type: str) -> None:
             if not api_url or not api_key:
                 app_logger.warning(f"Missing API URL or Key for instance '{instance_name}'. Skipping.")
                 continue
-            try:
-                # Use instance details for connection check
-                app_logger.debug(f"Checking connection to {app_type} instance '{instance_name}' at {api_url} with timeout {api_timeout}s")
-                connected = check_connection(api_url, api_key, api_timeout=api_timeout)
-                if not connected:
-                    app_logger.warning(f"Failed to connect to {app_type} instance '{instance_name}' at {api_url}. Skipping.")
-                    continue
-                app_logger.info(f"Successfully connected to {app_type} instance: {instance_name}")
-            except Exception as e:
-                app_logger.error(f"Error connecting to {app_type} instance '{instance_name}': {e}", exc_info=True)
+            if not connected:
+                app_logger.warning(f"Failed to connect to {app_type} instance '{instance_name}' at {api_url}. Skipping.")
                 continue # Skip this instance if connection fails
+            app_logger.info(f"Successfully connected to {app_type} instance: {instance_name}")
                 
             # --- API Cap Check --- #
             try:
                 # Check if hourly API cap is exceeded
                 if check_hourly_cap_exceeded(app_type):
                     # Get the current cap status for logging
-                    from src.primary.stats_manager import get_hourly_cap_status
                     cap_status = get_hourly_cap_status(app_type)
                     app_logger.warning(f"{app_type.upper()} hourly cap reached {cap_status['current_usage']} of {cap_status['limit']} (app-specific limit). Skipping cycle!")
                     continue # Skip this instance if API cap is exceeded
@@ -269,11 +273,13 @@ def app_specific_loop(app_type: str) -> None:
 
             # --- Queue Size Check --- # Moved inside loop
             # Get maximum_download_queue_size from general settings (still using minimum_download_queue_size key for backward compatibility)
-            general_settings = settings_manager.load_settings('general')
             max_queue_size = general_settings.get("minimum_download_queue_size", -1)
             app_logger.info(f"Using maximum download queue size: {max_queue_size} from general settings")
             
-            if max_queue_size >= 0:
+            if not hunt_missing_enabled and not hunt_upgrade_enabled:
+                # Nothing will be searched on this instance, so its queue size doesn't matter
+                app_logger.debug(f"No hunt modes enabled for {instance_name}, skipping queue size check")
+            elif max_queue_size >= 0:
                 try:
                     # Use instance details for queue check
                     current_queue_size = get_queue_size(api_url, api_key, api_timeout)
@@ -336,6 +342,10 @@ def app_specific_loop(app_type: str) -> None:
                 except Exception as e:
                     app_logger.error(f"Error during missing processing for {instance_name}: {e}", exc_info=True)
 
+            # Don't start the next stage for this instance once a stop is requested
+            if stop_event.is_set():
+                break
+
             # --- Process Upgrades --- #
             if hunt_upgrade_enabled and process_upgrades:
                 try:
@@ -372,8 +382,9 @@ def app_specific_loop(app_type: str) -> None:
                     app_logger.error(f"Error during upgrade processing for {instance_name}: {e}", exc_info=True)
 
             # Small delay between instances if needed (optional)
-            if not stop_event.is_set():
-                 time.sleep(1) # Short pause
+            if stop_event.is_set():
+                break
+            time.sleep(1) # Short pause
 
             # --- Process Swaparr (stalled downloads) --- #
             try:
@@ -389,7 +400,6 @@ def app_specific_loop(app_type: str) -> None:
                         process_stalled_downloads = None
                 
                 # Check if Swaparr is enabled
-                swaparr_settings = settings_manager.load_settings("swaparr")
                 if swaparr_settings and swaparr_settings.get("enabled", False) and process_stalled_downloads:
                     app_logger.info(f"Running Swaparr on {app_type} instance: {instance_name}")
                     process_stalled_downloads(app_type, combined_settings, swaparr_settings)
@@ -417,7 +427,6 @@ def app_specific_loop(app_type: str) -> None:
         
         # Mark cycle as ended (set cyclelock to False) and update next cycle time
         try:
-            from src.primary.cycle_tracker import end_cycle
             end_cycle(app_type, next_cycle_time)
         except Exception as e:
             app_logger.warning(f"Failed to mark cycle end for {app_type}: {e}")
@@ -425,7 +434,6 @@ def app_specific_loop(app_type: str) -> None:
         
         # Track cycle time for the countdown timer feature (legacy support)
         try:
-            from src.primary.cycle_tracker import update_next_cycle
             update_next_cycle(app_type, next_cycle_time)
         except Exception as e:
             app_logger.warning(f"Failed to update cycle tracker: {e}")
@@ -437,7 +445,6 @@ def app_specific_loop(app_type: str) -> None:
         wait_interval = 1  # Check every second to be more responsive
         elapsed = 0
         # Use cross-platform path for reset file
-        from src.primary.utils.config_paths import get_reset_path
         reset_file_path = get_reset_path(app_type)
                 
         while elapsed < sleep_seconds:
@@ -490,8 +497,6 @@ def reset_app_cycle(app_type: str) -> bool:
     logger.info(f"Manual cycle reset requested for {app_type} - Creating reset file")
     
     # Create a reset file for this app using cross-platform paths
-    from src.primary.utils.config_paths import get_reset_path
-    
     reset_file_path = get_reset_path(app_type)
     try:
         # Ensure directory exists
@@ -597,8 +602,6 @@ def hourly_cap_scheduler_loop():
     logger.info("Starting hourly API cap scheduler loop")
     
     try:
-        from src.primary.stats_manager import reset_hourly_caps
-        
         # Initial check in case we're starting right at the top of an hour
         current_time = datetime.datetime.now()
         if current_time.minute == 0:
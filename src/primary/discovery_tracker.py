@@ -5,16 +5,33 @@ Runs independently to check if previously missing episodes are now in Sonarr's w
 """
 
 import os
+import re
 import json
 import time
+import hmac
+import hashlib
+import logging
 import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from pathlib import Path
 
+# RapidFuzz is optional - without it series titles are only fuzzy matched by their words
+rapidfuzz_import_error = None
+try:
+    from rapidfuzz import fuzz, process
+except ImportError as e:
+    rapidfuzz_import_error = str(e)
+
 from src.primary.utils.config_paths import get_path
 from src.primary.utils.logger import get_logger
-from src.primary.history_manager import HISTORY_BASE_PATH, ensure_history_dir
+from src.primary.history_manager import (
+    HISTORY_BASE_PATH, ensure_history_dir, update_history_entries_bulk,
+    get_history_file_key, read_history_file_cached,
+)
 from src.primary import settings_manager
 from src.primary.apps.sonarr.api import arr_request
 
@@ -26,13 +43,53 @@ _discovery_lock = threading.Lock()
 _discovery_thread = None
 _discovery_stop_event = threading.Event()
 
+# Sonarr webhook events that mean a hunted episode has been found
+WEBHOOK_DISCOVERY_EVENTS = ("Grab", "Download")
+
+# Season/episode formats found in titles: S01E01, 1x01, Season 1 Episode 1. They are
+# combined into one pattern so a title is scanned once, and the first marker in it wins
+SEASON_EPISODE_PATTERN = re.compile(
+    r"S(\d+)E(\d+)|(\d+)x(\d+)|Season\s+(\d+)\s+Episode\s+(\d+)",
+    re.IGNORECASE
+)
+
+# Runs of anything other than letters and digits, collapsed when normalizing titles
+TITLE_NORMALIZE_PATTERN = re.compile(r"[^a-z0-9]+")
+
+# Translation table that lowercases ASCII letters and turns ASCII punctuation and whitespace
+# into spaces in one pass, used instead of the pattern for ASCII titles
+TITLE_NORMALIZE_TABLE = str.maketrans({chr(c): (chr(c).lower() if chr(c).isalnum() else " ") for c in range(128)})
+
+# Wanted episodes keyed by (season number, episode number); the normalized series titles are
+# stored as dict keys so membership tests are constant time while keeping insertion order
+WantedIndex = Dict[Tuple[Any, Any], Dict[str, None]]
+
+# Minimum RapidFuzz token set score for two series titles to be treated as the same series
+FUZZY_TITLE_MATCH_THRESHOLD = 85
+
+# Upper bound on the Sonarr instances queried at the same time for their wanted lists
+MAX_WANTED_FETCH_WORKERS = 8
+
 # Default configuration
 DEFAULT_HUNTING_CONFIG = {
     "discovery_check_interval_minutes": 10,
+    "discovery_max_interval_minutes": 60,
     "discovery_check_days_back": 7,
     "enabled": True
 }
 
+# Number of consecutive checks that found undiscovered entries but discovered nothing
+_idle_check_count = 0
+
+# Fingerprint of the wanted lists and history files from the last check, and how many
+# undiscovered entries that check found, so unchanged inputs are not matched again
+_last_check_fingerprint = None
+_last_pending_count = 0
+
+# Undiscovered entries of each history file keyed by path, with the parsed entries they were
+# filtered from, so files the history read cache still holds are not scanned on every check
+_undiscovered_cache: Dict[str, Tuple[Any, List[Dict[str, Any]]]] = {}
+
 def get_hunting_config() -> Dict[str, Any]:
     """Get hunting configuration from hunting.json"""
     try:
@@ -81,101 +138,217 @@ def get_sonarr_wanted_episodes(instance: Dict[str, Any]) -> List[Dict[str, Any]]
     api_key = instance.get("api_key")
     
     if not api_url or not api_key:
-        logger.warning(f"Missing API URL or key for Sonarr instance: {instance.get('name', 'Unknown')}")
+        logger.warning("Missing API URL or key for Sonarr instance: %s", instance.get('name', 'Unknown'))
         return []
     
-    try:
-        # Get wanted episodes from Sonarr's wanted endpoint
-        # Include pageSize in the endpoint URL
-        endpoint = "wanted/missing?pageSize=10000"
-        response = arr_request(
-            api_url=api_url,
-            api_key=api_key,
-            api_timeout=60,  # Default timeout
-            endpoint=endpoint,
-            method="GET"
-        )
-        
-        if response and "records" in response:
-            logger.info(f"Retrieved {len(response['records'])} wanted episodes from Sonarr instance: {instance.get('name', 'Unknown')}")
-            return response["records"]
-        else:
-            logger.warning(f"No wanted episodes found for Sonarr instance: {instance.get('name', 'Unknown')}")
-            return []
-            
-    except Exception as e:
-        logger.error(f"Error getting wanted episodes from Sonarr instance {instance.get('name', 'Unknown')}: {e}")
-        return []
+    # arr_request logs and swallows request errors itself and returns None on failure
+    endpoint = "wanted/missing?pageSize=10000"
+    response = arr_request(
+        api_url=api_url,
+        api_key=api_key,
+        api_timeout=60,  # Default timeout
+        endpoint=endpoint,
+        method="GET"
+    )
+    
+    if response and "records" in response:
+        logger.info("Retrieved %d wanted episodes from Sonarr instance: %s", len(response['records']), instance.get('name', 'Unknown'))
+        return response["records"]
+    
+    logger.warning("No wanted episodes found for Sonarr instance: %s", instance.get('name', 'Unknown'))
+    return []
 
-def check_episode_in_wanted(episode_info: Dict[str, Any], wanted_episodes: List[Dict[str, Any]]) -> bool:
-    """Check if an episode is in the wanted list based on series and episode info"""
-    try:
-        # Extract episode information from history entry
-        episode_title = episode_info.get("episode_title", "")
-        series_title = episode_info.get("series_title", "")
-        
-        # Try to extract season and episode numbers from the title
-        # Common formats: S01E01, 1x01, Season 1 Episode 1, etc.
-        import re
-        
-        # Extract season/episode from episode title or entry
-        season_episode_patterns = [
-            r"S(\d+)E(\d+)",  # S01E01
-            r"(\d+)x(\d+)",   # 1x01
-            r"Season\s+(\d+)\s+Episode\s+(\d+)",  # Season 1 Episode 1
-        ]
-        
-        season_num = None
-        episode_num = None
-        
-        # Try to extract from episode title first
-        for pattern in season_episode_patterns:
-            match = re.search(pattern, episode_title, re.IGNORECASE)
-            if match:
-                season_num = int(match.group(1))
-                episode_num = int(match.group(2))
-                break
-        
-        # If not found in episode title, try the series title
-        if season_num is None or episode_num is None:
-            for pattern in season_episode_patterns:
-                match = re.search(pattern, series_title, re.IGNORECASE)
-                if match:
-                    season_num = int(match.group(1))
-                    episode_num = int(match.group(2))
-                    break
-        
-        if season_num is None or episode_num is None:
-            logger.debug(f"Could not extract season/episode numbers from: {episode_title} or {series_title}")
-            return False
-        
-        # Look for matching episode in wanted list
-        for wanted_ep in wanted_episodes:
-            wanted_series = wanted_ep.get("series", {}).get("title", "")
-            wanted_season = wanted_ep.get("seasonNumber")
-            wanted_episode = wanted_ep.get("episodeNumber")
-            
-            # Check if series title matches (case insensitive)
-            if (wanted_series.lower() in series_title.lower() or 
-                series_title.lower() in wanted_series.lower()):
-                if wanted_season == season_num and wanted_episode == episode_num:
-                    logger.info(f"Found match: {series_title} S{season_num:02d}E{episode_num:02d}")
-                    return True
-        
+@lru_cache(maxsize=4096)
+def _normalize_title(title: str) -> str:
+    """Lowercase a title and collapse punctuation and whitespace to single spaces"""
+    if title.isascii():
+        return " ".join(title.translate(TITLE_NORMALIZE_TABLE).split())
+    return TITLE_NORMALIZE_PATTERN.sub(" ", title.lower()).strip()
+
+def _comparable_lengths(first_len: int, second_len: int) -> bool:
+    """Titles of very different lengths cannot be the same series"""
+    return min(first_len, second_len) * 3 >= max(first_len, second_len)
+
+@lru_cache(maxsize=8192)
+def _title_match(history_title: str, wanted_title: str) -> bool:
+    """
+    Check if two series titles refer to the same series
+    
+    Both titles must already be normalized with _normalize_title, which caches the
+    cleaned form of each title so it is computed once however many comparisons it is
+    part of. Titles match when they are equal or one contains the other; fuzzy
+    matching is done separately in batches by _fuzzy_title_match.
+    Results are cached since the same title pairs are compared on every check.
+    """
+    if not history_title or not wanted_title:
         return False
-        
-    except Exception as e:
-        logger.error(f"Error checking episode in wanted list: {e}")
+    
+    if history_title == wanted_title:
+        return True
+    
+    # Skip the costlier checks for titles of very different lengths
+    history_len, wanted_len = len(history_title), len(wanted_title)
+    if not _comparable_lengths(history_len, wanted_len):
+        return False
+    
+    # Only the shorter title can be contained in the longer one
+    shorter, longer = (history_title, wanted_title) if history_len <= wanted_len else (wanted_title, history_title)
+    return shorter in longer
+
+def _fuzzy_title_match(normalized_title: str, candidates: List[str]) -> bool:
+    """
+    Check if any normalized candidate title is a fuzzy match for a normalized title
+    
+    All candidates are scored in a single RapidFuzz call, which loops in native code
+    instead of comparing one pair at a time in Python. Without RapidFuzz, titles match
+    when all the words of one appear in the other, the case where the token set ratio
+    is a perfect score.
+    """
+    if rapidfuzz_import_error:
+        title_words = set(normalized_title.split())
+        for candidate in candidates:
+            candidate_words = set(candidate.split())
+            if title_words <= candidate_words or candidate_words <= title_words:
+                return True
+        return False
+    
+    return process.extractOne(
+        normalized_title, candidates, scorer=fuzz.token_set_ratio,
+        processor=None, score_cutoff=FUZZY_TITLE_MATCH_THRESHOLD
+    ) is not None
+
+def prepare_wanted_episodes(wanted_episodes: Iterable[Dict[str, Any]]) -> WantedIndex:
+    """
+    Index wanted episode records by season and episode number
+    
+    This is done once per discovery check so each history entry is matched with a
+    single dictionary lookup instead of a scan over every wanted episode.
+    
+    Titles are stored normalized and deduplicated so exact matches can be found with a
+    constant time membership test before any per-title comparison.
+    
+    Returns:
+        Dict mapping (season number, episode number) to the normalized series titles wanted for it
+    """
+    wanted_index = {}
+    for wanted_ep in wanted_episodes:
+        series = wanted_ep.get("series") or {}
+        key = (wanted_ep.get("seasonNumber"), wanted_ep.get("episodeNumber"))
+        wanted_index.setdefault(key, {})[_normalize_title(series.get("title", ""))] = None
+    return wanted_index
+
+@lru_cache(maxsize=4096)
+def _parse_season_episode(*titles: str) -> Optional[Tuple[int, int]]:
+    """
+    Extract season and episode numbers from the first title that contains them
+    
+    Cached because the same undiscovered history entries are parsed on every check.
+    
+    Returns:
+        (season number, episode number) or None if no title contains them
+    """
+    for title in titles:
+        match = SEASON_EPISODE_PATTERN.search(title)
+        if match:
+            # Only the two groups of the alternative that matched are set
+            season, episode = (group for group in match.groups() if group is not None)
+            return int(season), int(episode)
+    return None
+
+def _find_wanted_match(series_title: str, season_num: int, episode_num: int, wanted_episodes: WantedIndex) -> bool:
+    """Check the wanted episode index for an episode of a matching series"""
+    # Only series wanted for this exact season/episode need a title comparison
+    wanted_titles = wanted_episodes.get((season_num, episode_num), ())
+    if not wanted_titles:
+        return False
+    
+    # Common episode numbers like S01E01 can be wanted for many series, so check for an
+    # exact normalized title with a single lookup before comparing titles one at a time
+    normalized_title = _normalize_title(series_title)
+    if not normalized_title:
+        return False
+    if normalized_title in wanted_titles:
+        return True
+    
+    # Most entries match none of the wanted titles, so drop titles of very different
+    # lengths with one cheap pass before any title comparison or fuzzy scoring
+    title_len = len(normalized_title)
+    candidates = [wanted_series for wanted_series in wanted_titles if _comparable_lengths(title_len, len(wanted_series))]
+    if not candidates:
+        return False
+    
+    # Wanted titles are already normalized, so compare them against the normalized history
+    # title as they are, without fuzzy matching first, which finds most matches
+    if any(_title_match(normalized_title, wanted_series) for wanted_series in candidates):
+        return True
+    
+    return _fuzzy_title_match(normalized_title, candidates)
+
+@lru_cache(maxsize=4096)
+def _split_processed_info(processed_info: str) -> Tuple[str, str]:
+    """
+    Split a history entry's "Series - S01E02 - Episode" name into series and episode titles
+    
+    The episode part keeps its season/episode marker so the numbers can be parsed from it.
+    Names without a marker are returned whole as the series title.
+    """
+    match = SEASON_EPISODE_PATTERN.search(processed_info)
+    if not match:
+        return processed_info, ""
+    return processed_info[:match.start()].rstrip(" -"), processed_info[match.start():]
+
+def get_entry_titles(entry: Dict[str, Any]) -> Tuple[str, str]:
+    """Get the series and episode titles of a history entry"""
+    series_title = entry.get("series_title", "")
+    episode_title = entry.get("episode_title", "")
+    if series_title or episode_title:
+        return series_title, episode_title
+    
+    # Entries written by the Sonarr processors only store the combined name
+    return _split_processed_info(entry.get("processed_info", ""))
+
+def is_episode_entry(entry: Dict[str, Any]) -> bool:
+    """
+    Check if a history entry is for a single missing episode
+    
+    Season, show and upgrade searches are logged in the same history file, and show
+    entries use the series ID, which Sonarr numbers separately from episode IDs.
+    Only episode entries carry a season/episode marker in their name.
+    """
+    if entry.get("operation_type", "missing") != "missing":
+        return False
+    series_title, episode_title = get_entry_titles(entry)
+    return _parse_season_episode(episode_title, series_title) is not None
+
+def check_episode_in_wanted(episode_info: Dict[str, Any], wanted_episodes: WantedIndex) -> bool:
+    """Check if an episode is in the wanted episode index based on series and episode info"""
+    # Extract episode information from history entry
+    return is_episode_wanted(*get_entry_titles(episode_info), wanted_episodes)
+
+def is_episode_wanted(series_title: str, episode_title: str, wanted_episodes: WantedIndex) -> bool:
+    """Check if an episode is in the wanted episode index based on its series and episode titles"""
+    # Try to extract season/episode numbers from the episode title first, then the series title
+    season_episode = _parse_season_episode(episode_title, series_title)
+    if season_episode is None:
+        logger.debug("Could not extract season/episode numbers from: %s or %s", episode_title, series_title)
         return False
+    
+    season_num, episode_num = season_episode
+    if _find_wanted_match(series_title, season_num, episode_num, wanted_episodes):
+        logger.info("Found match: %s S%02dE%02d", series_title, season_num, episode_num)
+        return True
+    
+    return False
 
-def get_recent_history_entries(cutoff_date: datetime) -> List[str]:
-    """Get history entry file paths that are newer than cutoff_date"""
+def get_recent_history_entries(cutoff_date: datetime, app_type: Optional[str] = None) -> List[str]:
+    """Get history entry file paths that are newer than cutoff_date, optionally for a single app"""
     try:
         ensure_history_dir()
         history_entries = []
         
-        # Walk through all history files in the base directory
-        for root, dirs, files in os.walk(HISTORY_BASE_PATH):
+        # Walk through all history files in the base directory, or only the app's own directory
+        history_root = os.path.join(HISTORY_BASE_PATH, app_type) if app_type else HISTORY_BASE_PATH
+        for root, dirs, files in os.walk(history_root):
             for file in files:
                 if file.endswith('.json'):
                     file_path = os.path.join(root, file)
@@ -185,16 +358,43 @@ def get_recent_history_entries(cutoff_date: datetime) -> List[str]:
                         if file_mtime >= cutoff_date:
                             history_entries.append(file_path)
                     except Exception as e:
-                        logger.debug(f"Error checking file time for {file_path}: {e}")
+                        logger.debug("Error checking file time for %s: %s", file_path, e)
                         continue
         
-        logger.info(f"Found {len(history_entries)} recent history files")
+        logger.info("Found %d recent history files", len(history_entries))
         return history_entries
         
     except Exception as e:
         logger.error(f"Error getting recent history entries: {e}")
         return []
 
+def load_undiscovered_entries(entry_path: str) -> List[Dict[str, Any]]:
+    """
+    Get the missing-episode entries of a history file that have not been discovered yet
+    
+    Upgrade searches are left out, their episodes are never in the wanted missing list.
+    
+    The file is read through the history read cache, and the result is kept for as long
+    as that cache returns the same parsed entries, so unchanged history files are
+    neither read nor scanned again on later checks.
+    
+    Raises:
+        OSError, json.JSONDecodeError: If the file cannot be read or parsed
+    """
+    entry_data = read_history_file_cached(entry_path)
+    cached = _undiscovered_cache.get(entry_path)
+    if cached and cached[0] is entry_data:
+        return cached[1]
+    
+    # Handle both single entries and arrays of entries
+    entries_to_check = entry_data if isinstance(entry_data, list) else (entry_data,)
+    undiscovered = [
+        entry for entry in entries_to_check
+        if not entry.get("discovered", False) and entry.get("operation_type", "missing") == "missing"
+    ]
+    _undiscovered_cache[entry_path] = (entry_data, undiscovered)
+    return undiscovered
+
 def get_undiscovered_entries() -> List[Dict[str, Any]]:
     """
     Get all undiscovered history entries from the last N days for Sonarr
@@ -276,102 +476,274 @@ def update_history_entry_discovered(file_path: str, entry_index: int, discovered
             with open(file_path, 'w') as f:
                 json.dump(entries, f, indent=2)
             
-            logger.debug(f"Updated entry {entry_index} in {file_path} - discovered: {discovered}")
+            logger.debug("Updated entry %d in %s - discovered: %s", entry_index, file_path, discovered)
         
     except Exception as e:
         logger.error(f"Error updating history entry {entry_index} in {file_path}: {e}")
 
-def perform_discovery_check():
-    """Perform a discovery check on recent history entries"""
+def get_next_check_delay(config: Dict[str, Any], pending_count: int, discovered_count: int) -> int:
+    """
+    Work out how many seconds the discovery thread should wait before the next check.
+    
+    Checks run at the configured interval while entries are being discovered, back off
+    exponentially while undiscovered entries stay unchanged, and use the maximum
+    interval when there is nothing left to check.
+    
+    Args:
+        config: Hunting configuration
+        pending_count: Number of undiscovered entries examined in the last check
+        discovered_count: Number of entries discovered in the last check
+    
+    Returns:
+        Delay in seconds until the next check
+    """
+    global _idle_check_count
+    
+    base_delay = 60 * config.get('discovery_check_interval_minutes', 10)
+    max_delay = max(base_delay, 60 * config.get('discovery_max_interval_minutes', 60))
+    
+    if pending_count == 0:
+        _idle_check_count = 0
+        return max_delay
+    
+    if discovered_count > 0:
+        _idle_check_count = 0
+        return base_delay
+    
+    _idle_check_count += 1
+    return min(max_delay, base_delay * (2 ** _idle_check_count))
+
+def get_check_fingerprint(wanted_lookup: Dict[str, WantedIndex], history_files: List[str]) -> str:
+    """
+    Fingerprint the inputs of a discovery check
+    
+    Combines the prepared wanted episodes with the modification times and sizes of the
+    history files, so a matching fingerprint means the check would reach the same result.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(wanted_lookup).encode("utf-8"))
+    for history_file in sorted(history_files):
+        try:
+            digest.update(f"{history_file}:{get_history_file_key(history_file)}".encode("utf-8"))
+        except OSError:
+            digest.update(history_file.encode("utf-8"))
+    return digest.hexdigest()
+
+def perform_discovery_check() -> int:
+    """
+    Perform a discovery check on recent history entries
+    
+    Returns:
+        Suggested delay in seconds before the next check
+    """
+    global _last_check_fingerprint, _last_pending_count
+    
+    config = get_hunting_config()
     try:
-        config = get_hunting_config()
         if not config.get("enabled", True):
             logger.info("Discovery tracking is disabled")
-            return
+            return get_next_check_delay(config, 0, 0)
         
         days_back = config.get("discovery_check_days_back", 7)
-        logger.info(f"Starting discovery check for entries from the last {days_back} days")
+        logger.info("Starting discovery check for entries from the last %s days", days_back)
         
         # Get Sonarr instances
         sonarr_instances = get_sonarr_instances()
         if not sonarr_instances:
             logger.warning("No Sonarr instances configured")
-            return
+            return get_next_check_delay(config, 0, 0)
         
         # Get enabled instances only
         enabled_instances = [inst for inst in sonarr_instances if inst.get("enabled", True)]
         if not enabled_instances:
             logger.warning("No enabled Sonarr instances found")
-            return
-        
-        logger.info(f"Found {len(enabled_instances)} enabled Sonarr instance(s)")
-        
-        # Get wanted episodes from all enabled Sonarr instances
-        all_wanted_episodes = []
-        for instance in enabled_instances:
-            wanted_episodes = get_sonarr_wanted_episodes(instance)
-            all_wanted_episodes.extend(wanted_episodes)
-        
-        if not all_wanted_episodes:
-            logger.info("No wanted episodes found in any Sonarr instance")
-            return
+            return get_next_check_delay(config, 0, 0)
         
-        logger.info(f"Total wanted episodes across all instances: {len(all_wanted_episodes)}")
+        logger.info("Found %d enabled Sonarr instance(s)", len(enabled_instances))
         
-        # Get recent history entries
+        # Get recent history entries, only Sonarr entries can match the wanted episodes
         cutoff_date = datetime.now() - timedelta(days=days_back)
-        history_entry_files = get_recent_history_entries(cutoff_date)
+        history_entry_files = get_recent_history_entries(cutoff_date, "sonarr")
         
-        discovered_count = 0
         checked_count = 0
         error_count = 0
         
+        # Collect undiscovered entries first so the wanted lists are only fetched when needed,
+        # grouped by instance so each group is only matched against its own instance
+        undiscovered_entries = defaultdict(list)
+        cutoff_timestamp = cutoff_date.timestamp()
         for entry_path in history_entry_files:
+            if _discovery_stop_event.is_set():
+                logger.info("Stop requested, ending discovery check early")
+                return get_next_check_delay(config, 0, 0)
             try:
                 checked_count += 1
-                
-                # Load history entry
-                with open(entry_path, 'r') as f:
-                    entry_data = json.load(f)
-                
-                # Handle both single entries and arrays of entries
-                entries_to_check = []
-                if isinstance(entry_data, list):
-                    entries_to_check = entry_data
-                else:
-                    entries_to_check = [entry_data]
-                
-                file_modified = False
-                for i, entry in enumerate(entries_to_check):
-                    # Skip if already discovered
-                    if entry.get("discovered", False):
+                file_app_type = Path(entry_path).parent.name
+                for entry in load_undiscovered_entries(entry_path):
+                    # A recently written file can still hold entries from before the
+                    # window, skip those instead of fetching wanted lists to match them
+                    if entry.get("date_time", 0) < cutoff_timestamp:
                         continue
                     
-                    # Check if this episode is now in the wanted list
-                    if check_episode_in_wanted(entry, all_wanted_episodes):
-                        # Mark as discovered
-                        entry["discovered"] = True
-                        entry["discovered_at"] = datetime.now().isoformat()
-                        file_modified = True
-                        discovered_count += 1
-                        logger.info(f"Discovered episode: {entry.get('series_title', 'Unknown')} - {entry.get('episode_title', 'Unknown')}")
-                
-                # Save file if it was modified
-                if file_modified:
-                    with open(entry_path, 'w') as f:
-                        if isinstance(entry_data, list):
-                            json.dump(entries_to_check, f, indent=2)
-                        else:
-                            json.dump(entries_to_check[0], f, indent=2)
-                
-            except Exception as e:
+                    # Parse the season/episode numbers here, so entries without them are
+                    # dropped before the wanted lists are fetched and the matching loop below
+                    # looks them up directly instead of scanning the titles again
+                    series_title, episode_title = get_entry_titles(entry)
+                    season_episode = _parse_season_episode(episode_title, series_title)
+                    if season_episode is None:
+                        logger.debug("Could not extract season/episode numbers from: %s or %s", episode_title, series_title)
+                        continue
+                    
+                    # Pull out the fields matching needs once, so the matching loop below
+                    # unpacks tuples instead of looking up dict keys for every entry
+                    undiscovered_entries[entry.get("instance_name", "Default")].append((
+                        entry.get("app_type") or file_app_type,
+                        entry.get("id"),
+                        series_title,
+                        episode_title,
+                        season_episode,
+                    ))
+            except (OSError, json.JSONDecodeError) as e:
                 error_count += 1
-                logger.error(f"Error processing history entry {entry_path}: {e}")
+                logger.error("Error processing history entry %s: %s", entry_path, e)
+        
+        # Forget files that are no longer recent or have been removed
+        for cached_path in _undiscovered_cache.keys() - set(history_entry_files):
+            del _undiscovered_cache[cached_path]
+        
+        pending_count = sum(len(entries) for entries in undiscovered_entries.values())
+        if not pending_count:
+            logger.info("No undiscovered history entries to check")
+            return get_next_check_delay(config, 0, 0)
+        
+        # Only fetch the wanted lists of instances that have undiscovered entries
+        pending_instances = [inst for inst in enabled_instances if inst.get("name", "Default") in undiscovered_entries]
+        if not pending_instances:
+            logger.info("No undiscovered history entries for any enabled Sonarr instance")
+            return get_next_check_delay(config, 0, 0)
+        
+        # Fetch the wanted lists from those Sonarr instances in parallel, since each
+        # request is network bound, and index each instance's records as soon as it
+        # returns instead of waiting for the slowest instance
+        instance_lookups = {}
+        with ThreadPoolExecutor(max_workers=min(len(pending_instances), MAX_WANTED_FETCH_WORKERS)) as executor:
+            futures = {
+                executor.submit(get_sonarr_wanted_episodes, instance): instance.get("name", "Default")
+                for instance in pending_instances
+            }
+            for future in as_completed(futures):
+                instance_lookup = prepare_wanted_episodes(future.result())
+                if instance_lookup:
+                    instance_lookups[futures[future]] = instance_lookup
+        
+        # Keep the configured instance order, so the check fingerprint doesn't depend on response timing
+        wanted_lookup = {
+            instance.get("name", "Default"): instance_lookups[instance.get("name", "Default")]
+            for instance in pending_instances if instance.get("name", "Default") in instance_lookups
+        }
+        
+        if not wanted_lookup:
+            logger.info("No wanted episodes found in any Sonarr instance")
+            return get_next_check_delay(config, 0, 0)
+        
+        logger.info("Total wanted episodes across all instances: %d", sum(
+            len(titles) for instance_lookup in wanted_lookup.values() for titles in instance_lookup.values()
+        ))
+        
+        # Skip matching when neither the wanted lists nor the history files have changed
+        fingerprint = get_check_fingerprint(wanted_lookup, history_entry_files)
+        if fingerprint == _last_check_fingerprint:
+            logger.info("Wanted episodes and history unchanged since the last check, skipping matching")
+            return get_next_check_delay(config, _last_pending_count, 0)
+        
+        discovered_count = 0
+        stopped = False
+        
+        # Discovered entries are collected per history file and written in one go
+        pending_updates = {}
+        
+        for instance_name, instance_lookup in wanted_lookup.items():
+            for app_type, entry_id, series_title, episode_title, (season_num, episode_num) in undiscovered_entries[instance_name]:
+                # Stop matching on shutdown, the entries found so far are still saved below
+                if _discovery_stop_event.is_set():
+                    logger.info("Stop requested, ending discovery matching early")
+                    stopped = True
+                    break
+                
+                # Check if this episode is now in the instance's wanted list
+                if _find_wanted_match(series_title, season_num, episode_num, instance_lookup):
+                    pending_updates.setdefault((app_type, instance_name), []).append((entry_id, True, None))
+                    discovered_count += 1
+                    logger.info("Discovered episode: %s - %s", series_title or 'Unknown', episode_title or 'Unknown')
+            
+            if stopped:
+                break
+        
+        # Save all discovered entries with one write per history file
+        for (app_type, instance_name), updates in pending_updates.items():
+            update_history_entries_bulk(app_type, instance_name, updates)
+        
+        # Only remember the inputs when nothing changed, since writes update the history files
+        _last_check_fingerprint = fingerprint if not pending_updates and not error_count and not stopped else None
+        _last_pending_count = pending_count
         
-        logger.info(f"Discovery check complete: {checked_count} entries checked, {discovered_count} discovered, {error_count} errors/stopped")
+        logger.info("Discovery check complete: %d entries checked, %d discovered, %d errors/stopped", checked_count, discovered_count, error_count + stopped)
+        return get_next_check_delay(config, pending_count, discovered_count)
         
     except Exception as e:
-        logger.error(f"Error in discovery check: {e}")
+        # Include the traceback in debug mode so unexpected errors can be traced
+        logger.error(f"Error in discovery check: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
+        return get_next_check_delay(config, 0, 0)
+
+def find_sonarr_instance_by_api_key(api_key: str) -> Optional[Dict[str, Any]]:
+    """Find the configured Sonarr instance that uses the given API key"""
+    if not api_key:
+        return None
+    
+    for instance in get_sonarr_instances():
+        instance_key = instance.get("api_key", "")
+        if instance_key and hmac.compare_digest(instance_key.strip(), api_key.strip()):
+            return instance
+    
+    return None
+
+def handle_sonarr_webhook(instance_name: str, payload: Dict[str, Any]) -> int:
+    """
+    Mark history entries as discovered from a Sonarr webhook event.
+    
+    Sonarr sends the episode IDs it grabbed or imported, so the matching history
+    entries can be updated directly instead of waiting for the next discovery check.
+    
+    Args:
+        instance_name: Name of the Sonarr instance that sent the event
+        payload: Decoded webhook payload
+    
+    Returns:
+        Number of history entries marked as discovered
+    """
+    event_type = payload.get("eventType", "")
+    if event_type not in WEBHOOK_DISCOVERY_EVENTS:
+        logger.debug("Ignoring Sonarr webhook event '%s' from %s", event_type, instance_name)
+        return 0
+    
+    # The payload comes from outside, so tolerate missing, null or malformed fields
+    episodes = payload.get("episodes") or []
+    episode_ids = {
+        str(episode.get("id")) for episode in (episodes if isinstance(episodes, list) else ())
+        if isinstance(episode, dict) and episode.get("id") is not None
+    }
+    if not episode_ids:
+        logger.debug("Sonarr webhook event '%s' from %s contained no episodes", event_type, instance_name)
+        return 0
+    
+    updates = [(episode_id, True, None) for episode_id in episode_ids]
+    # Sonarr sends episode IDs, so only episode entries may match them
+    discovered_count = update_history_entries_bulk("sonarr", instance_name, updates, is_episode_entry)
+    
+    series = payload.get("series") or {}
+    series_title = series.get("title", "Unknown") if isinstance(series, dict) else "Unknown"
+    logger.info("Sonarr webhook '%s' from %s for %s: %d entries discovered", event_type, instance_name, series_title, discovered_count)
+    return discovered_count
 
 def discovery_thread():
     """
@@ -379,8 +751,9 @@ def discovery_thread():
     """
     try:
         while not _discovery_stop_event.is_set():
-            perform_discovery_check()
-            time.sleep(60 * get_hunting_config().get('discovery_check_interval_minutes', 10))
+            next_delay = perform_discovery_check()
+            logger.debug("Next discovery check in %d seconds", next_delay)
+            _discovery_stop_event.wait(next_delay)
     except Exception as e:
         logger.error(f"Discovery thread error: {e}")
 
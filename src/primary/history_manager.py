@@ -1,10 +1,19 @@
 import os
+import sys
 import json
 import time
 from datetime import datetime
 import threading
 import logging
 import pathlib
+from operator import itemgetter
+
+# orjson is optional - it reads and writes large history files much faster than the stdlib
+orjson_import_error = None
+try:
+    import orjson
+except ImportError as e:
+    orjson_import_error = str(e)
 
 # Create a logger
 logger = logging.getLogger(__name__)
@@ -27,6 +36,81 @@ history_locks = {
     "swaparr": threading.Lock()
 }
 
+# Parsed history files by path string, with the (mtime_ns, size) they were read at
+history_read_cache = {}
+
+# Entry fields that repeat the same small set of values across every history file
+INTERNED_ENTRY_FIELDS = ("instance_name", "app_type", "operation_type")
+
+def intern_entry_fields(entries):
+    """Intern the repeated string fields of loaded history entries so they share one copy"""
+    for entry in entries:
+        for field in INTERNED_ENTRY_FIELDS:
+            value = entry.get(field)
+            if isinstance(value, str):
+                entry[field] = sys.intern(value)
+    return entries
+
+def read_history_file(history_file):
+    """
+    Read the entries of a history file
+    
+    Raises json.JSONDecodeError for a corrupt file; orjson's decode error is a subclass,
+    so callers handle both parsers the same way.
+    """
+    if orjson_import_error:
+        with open(history_file, 'r') as f:
+            return json.load(f)
+    with open(history_file, 'rb') as f:
+        return orjson.loads(f.read())
+
+def get_history_file_key(history_file):
+    """
+    Get the (mtime_ns, size) of a history file, which changes whenever the file is rewritten
+    
+    Raises:
+        OSError: If the file cannot be accessed
+    """
+    file_stat = os.stat(history_file)
+    return (file_stat.st_mtime_ns, file_stat.st_size)
+
+def read_history_file_cached(history_file):
+    """
+    Read the entries of a history file for display, reusing the last parse while the file is unchanged
+    
+    History files are replaced on every write, so a matching modification time and size
+    means the cached entries are still current. The cached entries are shared between
+    calls and must not be modified by the caller.
+    """
+    cache_path = os.fspath(history_file)
+    file_key = get_history_file_key(cache_path)
+    cached = history_read_cache.get(cache_path)
+    if cached and cached[0] == file_key:
+        return cached[1]
+    
+    entries = read_history_file(cache_path)
+    if isinstance(entries, list):
+        intern_entry_fields(entries)
+    history_read_cache[cache_path] = (file_key, entries)
+    return entries
+
+def write_history_file(history_file, history_data):
+    """
+    Write history data to a file atomically
+    
+    The data is written to a temporary file in the same directory and moved over the
+    history file, so readers never see a partly written file and an interrupted write
+    leaves the previous contents in place.
+    """
+    temp_file = history_file.with_name(f"{history_file.name}.tmp")
+    if orjson_import_error:
+        with open(temp_file, 'w') as f:
+            json.dump(history_data, f, indent=2)
+    else:
+        with open(temp_file, 'wb') as f:
+            f.write(orjson.dumps(history_data, option=orjson.OPT_INDENT_2))
+    os.replace(temp_file, history_file)
+
 def ensure_history_dir():
     """Ensure the history directory exists with app-specific subdirectories"""
     try:
@@ -64,73 +148,175 @@ def add_history_entry(app_type, entry_data):
         - instance_name: str - Name of the instance
         - id: str - ID of the processed content
     """
+    added_entries = add_history_entries(app_type, [entry_data])
+    return added_entries[0] if added_entries else None
+
+def add_history_entries(app_type, entries_data):
+    """
+    Add several history entries, writing each instance history file once
+    
+    Parameters:
+    - app_type: str - The app type (sonarr, radarr, etc)
+    - entries_data: list of dicts with the same required fields as add_history_entry
+    
+    Returns:
+    - list of the entries that were added
+    """
     if not ensure_history_dir():
         logger.error("Could not ensure history directory exists")
-        return None
+        return []
     
     if app_type not in history_locks:
         logger.error(f"Invalid app type: {app_type}")
-        return None
+        return []
     
     required_fields = ["name", "instance_name", "id"]
-    for field in required_fields:
-        if field not in entry_data:
-            logger.error(f"Missing required field: {field}")
-            return None
-    
-    # Log the instance name for debugging
-    instance_name = entry_data["instance_name"]
-    logger.debug(f"Adding history entry for {app_type} with instance_name: '{instance_name}'")
-    
-    # Create the entry with timestamp
-    timestamp = int(time.time())
-    entry = {
-        "date_time": timestamp,
-        "date_time_readable": datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S'),
-        "processed_info": entry_data["name"],
-        "id": entry_data["id"],
-        "instance_name": instance_name,  # Use the instance_name we extracted above
-        "operation_type": entry_data.get("operation_type", "missing"),  # Default to "missing" if not specified
-        "app_type": app_type,  # Include app_type in the entry for display in UI
-        "discovered": False  # Default to false - will be updated by discovery tracker
-    }
-    
-    history_file = get_history_file_path(app_type, instance_name)
-    logger.debug(f"Writing to history file: {history_file}")
     
-    # Make sure the parent directory exists
-    history_file.parent.mkdir(exist_ok=True, parents=True)
-    
-    # Thread-safe file operation
-    with history_locks[app_type]:
-        try:
-            if history_file.exists():
-                with open(history_file, 'r') as f:
-                    history_data = json.load(f)
-            else:
-                history_data = []
-        except (json.JSONDecodeError, FileNotFoundError):
-            # If file doesn't exist or is corrupt, start with empty list
-            history_data = []
+    # Group the new entries by instance so each history file is read and written once
+    entries_by_instance = {}
+    for entry_data in entries_data:
+        missing_fields = [field for field in required_fields if field not in entry_data]
+        if missing_fields:
+            logger.error(f"Missing required field: {missing_fields[0]}")
+            continue
         
-        # Add new entry at the beginning for most recent first
-        history_data.insert(0, entry)
+        # Log the instance name for debugging
+        instance_name = entry_data["instance_name"]
+        logger.debug(f"Adding history entry for {app_type} with instance_name: '{instance_name}'")
         
-        # Write back to file
-        with open(history_file, 'w') as f:
-            json.dump(history_data, f, indent=2)
-    
-    logger.info(f"Added history entry for {app_type}-{instance_name}: {entry_data['name']}")
+        # Create the entry with timestamp
+        timestamp = int(time.time())
+        entry = {
+            "date_time": timestamp,
+            "date_time_readable": datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+            "processed_info": entry_data["name"],
+            "id": str(entry_data["id"]),  # IDs are always stored as strings so lookups never convert them
+            "instance_name": instance_name,  # Use the instance_name we extracted above
+            "operation_type": entry_data.get("operation_type", "missing"),  # Default to "missing" if not specified
+            "app_type": app_type,  # Include app_type in the entry for display in UI
+            "discovered": False  # Default to false - will be updated by discovery tracker
+        }
+        entries_by_instance.setdefault(instance_name, []).append(entry)
+    
+    added_entries = []
+    for instance_name, new_entries in entries_by_instance.items():
+        history_file = get_history_file_path(app_type, instance_name)
+        logger.debug(f"Writing {len(new_entries)} entries to history file: {history_file}")
+        
+        # Make sure the parent directory exists
+        history_file.parent.mkdir(exist_ok=True, parents=True)
+        
+        # Thread-safe file operation
+        with history_locks[app_type]:
+            try:
+                if history_file.exists():
+                    history_data = read_history_file(history_file)
+                else:
+                    history_data = []
+            except (json.JSONDecodeError, FileNotFoundError):
+                # If file doesn't exist or is corrupt, start with empty list
+                history_data = []
+            
+            # Add new entries at the beginning for most recent first
+            history_data[:0] = reversed(new_entries)
+            
+            # Write back to file
+            write_history_file(history_file, history_data)
+        
+        logger.info("Added %d history entries for %s-%s", len(new_entries), app_type, instance_name)
+        for entry in new_entries:
+            logger.debug("Added history entry for %s-%s: %s", app_type, instance_name, entry['processed_info'])
+        added_entries.extend(new_entries)
     
-    # Send notification about this history entry
+    # Send notifications about the new history entries
     try:
         # Import here to avoid circular imports
         from src.primary.notification_manager import send_history_notification
-        send_history_notification(entry)
     except Exception as e:
         logger.error(f"Failed to send notification for history entry: {e}")
+        return added_entries
     
-    return entry
+    for entry in added_entries:
+        try:
+            send_history_notification(entry)
+        except Exception as e:
+            logger.error(f"Failed to send notification for history entry: {e}")
+    
+    return added_entries
+
+def update_history_entries_bulk(app_type, instance_name, updates, entry_filter=None):
+    """
+    Update the discovered status of several history entries with a single write
+
+    Parameters:
+    - app_type: str - The app type (sonarr, radarr, etc)
+    - instance_name: str - Name of the instance whose history file is updated
+    - updates: list of (entry_id, discovered, info) tuples where info is an optional
+      dict of extra fields to store on the entry
+    - entry_filter: callable - Optional check an entry with a matching ID must also pass,
+      for IDs that are shared by different kinds of entries
+
+    Returns:
+    - int - Number of entries that were changed
+    """
+    if app_type not in history_locks:
+        logger.error(f"Invalid app type: {app_type}")
+        return 0
+
+    if not updates:
+        return 0
+
+    # Index the updates by ID so the history file is only scanned once
+    updates_by_id = {str(entry_id): (discovered, info) for entry_id, discovered, info in updates}
+
+    history_file = get_history_file_path(app_type, instance_name)
+    if not history_file.exists():
+        return 0
+
+    updated_count = 0
+    with history_locks[app_type]:
+        try:
+            history_data = read_history_file(history_file)
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            logger.error(f"Error reading history file {history_file}: {e}")
+            return 0
+
+        discovered_at = datetime.now().isoformat()
+        for entry in history_data:
+            # Entries are written with string IDs, only older files can hold other types
+            entry_id = entry.get("id", "")
+            update = updates_by_id.get(entry_id if type(entry_id) is str else str(entry_id))
+            if update is None or (entry_filter is not None and not entry_filter(entry)):
+                continue
+
+            discovered, info = update
+            if entry.get("discovered", False) == discovered:
+                continue
+
+            entry["discovered"] = discovered
+            if discovered:
+                entry["discovered_at"] = discovered_at
+            if info:
+                entry.update(info)
+            updated_count += 1
+
+        # Write back to file once for all updates
+        if updated_count:
+            write_history_file(history_file, history_data)
+
+    logger.debug(f"Updated {updated_count} history entries for {app_type}-{instance_name}")
+    return updated_count
+
+def filter_history_entries(entries, search_query):
+    """Yield the entries matching a lowercase search query, or all entries if there is none"""
+    if not search_query:
+        return entries
+    return (
+        entry for entry in entries if
+        search_query in entry.get("processed_info", "").lower() or
+        search_query in entry.get("instance_name", "").lower() or
+        search_query in str(entry.get("id", "")).lower()
+    )
 
 def get_history(app_type, search_query=None, page=1, page_size=20):
     """
@@ -155,6 +341,13 @@ def get_history(app_type, search_query=None, page=1, page_size=20):
     
     result = []
     
+    # Normalize the search query once; entries are filtered as each file is read so
+    # non-matching entries are never collected into the combined list
+    if search_query and search_query.strip():
+        search_query = search_query.lower()
+    else:
+        search_query = None
+    
     if app_type == "all":
         # Combine histories from all apps and their instances
         for app in history_locks.keys():
@@ -164,10 +357,9 @@ def get_history(app_type, search_query=None, page=1, page_size=20):
             if app_dir.exists():
                 for history_file in app_dir.glob("*.json"):
                     try:
-                        with open(history_file, 'r') as f:
-                            instance_history = json.load(f)
-                            result.extend(instance_history)
-                            logger.debug(f"Read {len(instance_history)} entries from {history_file}")
+                        instance_history = read_history_file_cached(history_file)
+                        result.extend(filter_history_entries(instance_history, search_query))
+                        logger.debug(f"Read {len(instance_history)} entries from {history_file}")
                     except (json.JSONDecodeError, FileNotFoundError) as e:
                         logger.warning(f"Error reading instance history file {history_file}: {str(e)}")
     else:
@@ -184,25 +376,15 @@ def get_history(app_type, search_query=None, page=1, page_size=20):
             
             for history_file in instance_files:
                 try:
-                    with open(history_file, 'r') as f:
-                        instance_history = json.load(f)
-                        result.extend(instance_history)
-                        logger.debug(f"Read {len(instance_history)} entries from {history_file}")
+                    instance_history = read_history_file_cached(history_file)
+                    result.extend(filter_history_entries(instance_history, search_query))
+                    logger.debug(f"Read {len(instance_history)} entries from {history_file}")
                 except (json.JSONDecodeError, FileNotFoundError) as e:
                     logger.warning(f"Error reading instance history file {history_file}: {e}")
     
-    # Sort by date_time in descending order
-    result = sorted(result, key=lambda x: x["date_time"], reverse=True)
-    
-    # Apply search filter if provided
-    if search_query and search_query.strip():
-        search_query = search_query.lower()
-        result = [
-            entry for entry in result if 
-            search_query in entry.get("processed_info", "").lower() or
-            search_query in entry.get("instance_name", "").lower() or
-            search_query in str(entry.get("id", "")).lower()
-        ]
+    # Sort by date_time in descending order, in place since the list is already our own,
+    # with a C-level key function since every entry of every file is sorted
+    result.sort(key=itemgetter("date_time"), reverse=True)
     
     # Calculate pagination
     total_entries = len(result)
@@ -214,10 +396,10 @@ def get_history(app_type, search_query=None, page=1, page_size=20):
     elif page > total_pages:
         page = total_pages
     
-    # Get entries for the current page
+    # Get entries for the current page, as copies since the entries are shared with the read cache
     start_idx = (page - 1) * page_size
     end_idx = start_idx + page_size
-    paginated_entries = result[start_idx:end_idx]
+    paginated_entries = [dict(entry) for entry in result[start_idx:end_idx]]
     
     # Calculate "how long ago" for each entry
     current_time = int(time.time())
@@ -343,8 +525,7 @@ def handle_instance_rename(app_type, old_instance_name, new_instance_name):
             old_data = []
             if old_file.exists():
                 try:
-                    with open(old_file, 'r') as f:
-                        old_data = json.load(f)
+                    old_data = read_history_file(old_file)
                     logger.info(f"Loaded {len(old_data)} history entries from {old_file}")
                 except (json.JSONDecodeError, FileNotFoundError) as e:
                     logger.warning(f"Error reading old history file {old_file}: {e}")
@@ -357,8 +538,7 @@ def handle_instance_rename(app_type, old_instance_name, new_instance_name):
             new_data = []
             if new_file.exists():
                 try:
-                    with open(new_file, 'r') as f:
-                        new_data = json.load(f)
+                    new_data = read_history_file(new_file)
                     logger.info(f"Loaded {len(new_data)} existing history entries from {new_file}")
                 except (json.JSONDecodeError, FileNotFoundError) as e:
                     logger.warning(f"Error reading new history file {new_file}: {e}")
@@ -374,8 +554,7 @@ def handle_instance_rename(app_type, old_instance_name, new_instance_name):
             new_data = sorted(new_data, key=lambda x: x.get("date_time", 0), reverse=True)
             
             # Save merged data to new file
-            with open(new_file, 'w') as f:
-                json.dump(new_data, f, indent=2)
+            write_history_file(new_file, new_data)
             logger.info(f"Saved {len(new_data)} history entries to {new_file}")
             
             # Optionally delete old file if it exists
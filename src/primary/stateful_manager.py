@@ -208,17 +208,17 @@ def get_processed_ids(app_type: str, instance_name: str) -> Set[str]:
     safe_instance_name = "".join([c if c.isalnum() else "_" for c in instance_name])
     
     file_path = STATEFUL_DIR / app_type / f"{safe_instance_name}.json"
-    stateful_logger.debug(f"[get_processed_ids] Checking file: {file_path} for {app_type}/{instance_name}") # DEBUG LOG
+    stateful_logger.debug("[get_processed_ids] Checking file: %s for %s/%s", file_path, app_type, instance_name) # DEBUG LOG
     
     if not file_path.exists():
-        stateful_logger.debug(f"[get_processed_ids] File not found: {file_path}") # DEBUG LOG
+        stateful_logger.debug("[get_processed_ids] File not found: %s", file_path) # DEBUG LOG
         return set()
     
     try:
         with open(file_path, 'r') as f:
             data = json.load(f)
             processed_ids_set = set(data.get("processed_ids", [])) # Convert list to set
-            stateful_logger.debug(f"[get_processed_ids] Read {len(processed_ids_set)} IDs from {file_path}: {processed_ids_set}") # DEBUG LOG
+            stateful_logger.debug("[get_processed_ids] Read %d IDs from %s: %s", len(processed_ids_set), file_path, processed_ids_set) # DEBUG LOG
             return processed_ids_set
     except Exception as e:
         stateful_logger.error(f"Error reading processed IDs for {instance_name} from {file_path}: {e}") # Updated log
@@ -233,45 +233,54 @@ def add_processed_id(app_type: str, instance_name: str, media_id: str) -> bool:
         instance_name: The name of the instance
         media_id: The ID of the processed media
         
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return add_processed_ids(app_type, instance_name, [media_id])
+
+def add_processed_ids(app_type: str, instance_name: str, media_ids: List[str]) -> bool:
+    """
+    Add several media IDs to the processed list for a specific app instance,
+    writing the state file once.
+
+    Args:
+        app_type: The type of app (sonarr, radarr, etc.)
+        instance_name: The name of the instance
+        media_ids: The IDs of the processed media
+
     Returns:
         bool: True if successful, False otherwise
     """
     if app_type not in APP_TYPES:
         stateful_logger.warning(f"Unknown app type: {app_type}")
         return False
-    
+
     # Create safe filename from instance name
     safe_instance_name = "".join([c if c.isalnum() else "_" for c in instance_name])
-    
+
     file_path = STATEFUL_DIR / app_type / f"{safe_instance_name}.json"
-    
-    # Get existing processed IDs using the get function (which includes logging)
+
     current_processed_ids_set = get_processed_ids(app_type, instance_name)
-    
-    # Convert set back to list for appending and saving
     processed_ids_list = list(current_processed_ids_set)
-    
-    # Add the new ID if it's not already there
-    if media_id not in current_processed_ids_set:
-        processed_ids_list.append(media_id)
-        stateful_logger.debug(f"[add_processed_id] Adding ID {media_id} to list for {app_type}/{instance_name}") # DEBUG LOG
-    else:
-        stateful_logger.debug(f"[add_processed_id] ID {media_id} already in list for {app_type}/{instance_name}") # DEBUG LOG
-        # No need to write if the ID is already present
+
+    # Keep the order of the new IDs, skipping any that are already present
+    new_ids = [media_id for media_id in dict.fromkeys(media_ids) if media_id not in current_processed_ids_set]
+    if not new_ids:
+        # No need to write if every ID is already present
         return True
-        
-    # Write the updated list back to the file
-    stateful_logger.debug(f"[add_processed_id] Writing {len(processed_ids_list)} IDs to {file_path}: {processed_ids_list}") # DEBUG LOG
+
+    processed_ids_list.extend(new_ids)
+    stateful_logger.debug("[add_processed_ids] Adding %d IDs to list for %s/%s", len(new_ids), app_type, instance_name)
+
     try:
         with open(file_path, 'w') as f:
             json.dump({
                 "processed_ids": processed_ids_list,
                 "last_updated": int(time.time())
             }, f, indent=2)
-        # Removed redundant log here, previous debug log is sufficient
         return True
     except Exception as e:
-        stateful_logger.error(f"Error adding media ID {media_id} to {file_path}: {e}")
+        stateful_logger.error(f"Error adding {len(new_ids)} media IDs to {file_path}: {e}")
         return False
 
 def is_processed(app_type: str, instance_name: str, media_id: str) -> bool:
@@ -298,7 +307,7 @@ def is_processed(app_type: str, instance_name: str, media_id: str) -> bool:
     media_id_str = str(media_id)
     is_in_set = media_id_str in processed_ids
     
-    stateful_logger.info(f"is_processed check: {app_type}/{instance_name}, ID:{media_id_str}, Found:{is_in_set}, File:{file_path}, Total IDs:{len(processed_ids)}")
+    stateful_logger.debug("is_processed check: %s/%s, ID:%s, Found:%s, File:%s, Total IDs:%d", app_type, instance_name, media_id_str, is_in_set, file_path, len(processed_ids))
     
     return is_in_set
 
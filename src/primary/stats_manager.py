@@ -12,7 +12,7 @@ import datetime
 import threading
 from typing import Dict, Any, Optional
 from src.primary.utils.logger import get_logger
-from src.primary.settings_manager import get_advanced_setting
+from src.primary.settings_manager import get_advanced_setting, load_settings
 # Import centralized path configuration
 from src.primary.utils.config_paths import CONFIG_PATH
 
@@ -25,6 +25,11 @@ STATS_DIRS = [
     os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data/tally") # Relative to script (fallback)
 ]
 
+# Valid names checked on every increment, as sets for constant time membership tests
+HOURLY_CAP_APP_TYPES = frozenset(("sonarr", "radarr", "lidarr", "readarr", "whisparr", "eros"))
+STATS_APP_TYPES = HOURLY_CAP_APP_TYPES | {"swaparr"}
+STAT_TYPES = frozenset(("hunted", "upgraded"))
+
 # Lock for thread-safe operations
 stats_lock = threading.Lock()
 hourly_lock = threading.Lock()
@@ -264,7 +269,7 @@ def increment_hourly_cap(app_type: str, count: int = 1) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    if app_type not in ["sonarr", "radarr", "lidarr", "readarr", "whisparr", "eros"]:
+    if app_type not in HOURLY_CAP_APP_TYPES:
         logger.error(f"Invalid app_type for hourly cap: {app_type}")
         return False
     
@@ -278,7 +283,6 @@ def increment_hourly_cap(app_type: str, count: int = 1) -> bool:
         new_value = caps[app_type]["api_hits"]
         
         # Get the hourly cap from the app's specific configuration
-        from src.primary.settings_manager import load_settings
         app_settings = load_settings(app_type)
         hourly_limit = app_settings.get("hourly_cap", 20)  # Default to 20 if not set
         
@@ -311,14 +315,13 @@ def get_hourly_cap_status(app_type: str) -> Dict[str, Any]:
     Returns:
         Dictionary with usage information
     """
-    if app_type not in ["sonarr", "radarr", "lidarr", "readarr", "whisparr", "eros"]:
+    if app_type not in HOURLY_CAP_APP_TYPES:
         return {"error": f"Invalid app_type: {app_type}"}
     
     with hourly_lock:
         caps = load_hourly_caps()
         
         # Get the hourly cap from the app's specific configuration
-        from src.primary.settings_manager import load_settings
         app_settings = load_settings(app_type)
         hourly_limit = app_settings.get("hourly_cap", 20)  # Default to 20 if not set
         
@@ -329,7 +332,7 @@ def get_hourly_cap_status(app_type: str) -> Dict[str, Any]:
             "current_usage": current_usage,
             "limit": hourly_limit,
             "remaining": max(0, hourly_limit - current_usage),
-            "percent_used": int((current_usage / hourly_limit) * 100) if hourly_limit > 0 else 0,
+            "percent_used": int(current_usage * 100 // hourly_limit) if hourly_limit > 0 else 0,
             "exceeded": current_usage >= hourly_limit
         }
 
@@ -391,11 +394,11 @@ def increment_stat(app_type: str, stat_type: str, count: int = 1) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    if app_type not in ["sonarr", "radarr", "lidarr", "readarr", "whisparr", "eros", "swaparr"]:
+    if app_type not in STATS_APP_TYPES:
         logger.error(f"Invalid app_type: {app_type}")
         return False
         
-    if stat_type not in ["hunted", "upgraded"]:
+    if stat_type not in STAT_TYPES:
         logger.error(f"Invalid stat_type: {stat_type}")
         return False
     
@@ -439,11 +442,11 @@ def increment_stat_only(app_type: str, stat_type: str, count: int = 1) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    if app_type not in ["sonarr", "radarr", "lidarr", "readarr", "whisparr", "eros", "swaparr"]:
+    if app_type not in STATS_APP_TYPES:
         logger.error(f"Invalid app_type: {app_type}")
         return False
         
-    if stat_type not in ["hunted", "upgraded"]:
+    if stat_type not in STAT_TYPES:
         logger.error(f"Invalid stat_type: {stat_type}")
         return False
     
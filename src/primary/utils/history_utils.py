@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from src.primary.history_manager import add_history_entry
+from src.primary.history_manager import add_history_entry, add_history_entries
 from src.primary.utils.logger import get_logger
 
 logger = get_logger("history")
@@ -39,3 +39,40 @@ def log_processed_media(app_type, media_name, media_id, instance_name, operation
     except Exception as e:
         logger.error(f"Error logging history entry: {str(e)}")
         return False
+
+def log_processed_media_batch(app_type, media_items, instance_name, operation_type="missing"):
+    """
+    Log several processed media items for one app instance with a single history write
+    
+    Parameters:
+    - app_type: str - The app type (sonarr, radarr, etc)
+    - media_items: list of (media_name, media_id) tuples
+    - instance_name: str - Name of the instance that processed them
+    - operation_type: str - Type of operation ("missing" or "upgrade")
+    
+    Returns:
+    - int - Number of history entries logged
+    """
+    if not media_items:
+        return 0
+    
+    try:
+        logger.debug(f"Logging {len(media_items)} history entries for {app_type} - {instance_name}")
+        
+        entries_data = [
+            {
+                "name": media_name,
+                "id": str(media_id),
+                "instance_name": instance_name,
+                "operation_type": operation_type
+            }
+            for media_name, media_id in media_items
+        ]
+        
+        added_entries = add_history_entries(app_type, entries_data)
+        if len(added_entries) < len(entries_data):
+            logger.error(f"Failed to log {len(entries_data) - len(added_entries)} history entries for {app_type} - {instance_name}")
+        return len(added_entries)
+    except Exception as e:
+        logger.error(f"Error logging history entries: {str(e)}")
+        return 0
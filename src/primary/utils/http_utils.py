@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP session setup for the Starr app API clients
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def create_arr_session(pool_connections=16, pool_maxsize=32):
+    """
+    Create a requests session for talking to a Starr app
+
+    The connection pool is large enough for the parallel requests made to one instance,
+    so their connections are kept alive. Connection failures are retried with a short
+    backoff, since no request reached the app yet; read and status errors are not retried.
+
+    Parameters:
+    - pool_connections: int - Number of hosts to keep connection pools for
+    - pool_maxsize: int - Connections kept alive per host
+
+    Returns:
+    - requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=2, connect=2, read=False, status=False, backoff_factor=0.2)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
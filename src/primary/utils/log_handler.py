@@ -1,6 +1,9 @@
 import re
 import logging
 
+# Compiled once since the filter runs for every log record
+WEB_URL_PATTERN = re.compile(r'(http|https)://[^\s<>"]+')
+
 class WebUrlFilter(logging.Filter):
     """Filter out web URLs from log messages"""
     
@@ -14,11 +17,7 @@ class WebUrlFilter(logging.Filter):
                 return False
                 
             # Redact URLs if they need to appear in logs
-            record.msg = re.sub(
-                r'(http|https)://[^\s<>"]+',
-                '[REDACTED URL]',
-                record.msg
-            )
+            record.msg = WEB_URL_PATTERN.sub('[REDACTED URL]', record.msg)
         
         return True
 
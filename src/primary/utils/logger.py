@@ -4,10 +4,12 @@ Logging configuration for Huntarr
 Supports separate log files for each application type
 """
 
+import json
 import logging
 import sys
 import os
 import pathlib
+from logging.handlers import RotatingFileHandler
 from typing import Dict, Optional
 
 # Use the centralized path configuration
@@ -19,6 +21,10 @@ from src.primary.utils.config_paths import LOG_DIR
 # Default log file for general messages
 MAIN_LOG_FILE = LOG_DIR / "huntarr.log"
 
+# Log files are rotated so debug logging cannot grow them without bound
+LOG_MAX_BYTES = 10 * 1024 * 1024  # 10 MB per file
+LOG_BACKUP_COUNT = 3  # Rotated files kept alongside the active one
+
 # App-specific log files
 APP_LOG_FILES = {
     "sonarr": LOG_DIR / "sonarr.log", # Updated filename
@@ -69,7 +75,7 @@ def setup_main_logger(debug_mode=None):
     console_handler.setLevel(logging.DEBUG if use_debug_mode else logging.INFO)
 
     # Create file handler
-    file_handler = logging.FileHandler(log_file)
+    file_handler = RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
     file_handler.setLevel(logging.DEBUG if use_debug_mode else logging.INFO)
 
     # Set format for the main logger
@@ -139,7 +145,7 @@ def get_logger(app_type: str) -> logging.Logger:
     
     # Create file handler for the specific app log file
     log_file = APP_LOG_FILES[app_type]
-    file_handler = logging.FileHandler(log_file)
+    file_handler = RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
     file_handler.setLevel(logging.DEBUG if debug_mode else logging.INFO)
     
     # Set a distinct format for this app log
@@ -214,11 +220,11 @@ def debug_log(message: str, data: object = None, app_type: Optional[str] = None)
     """
     current_logger = get_logger(app_type) if app_type else logger
     
-    if current_logger.level <= logging.DEBUG:
-        current_logger.debug(f"{message}")
+    # Check the effective level so the data is only serialized when it will be written
+    if current_logger.isEnabledFor(logging.DEBUG):
+        current_logger.debug(message)
         if data is not None:
             try:
-                import json
                 as_json = json.dumps(data)
                 if len(as_json) > 500:
                     as_json = as_json[:500] + "..."